@@ -1,6 +1,11 @@
+import hashlib
+import json
+import mimetypes
 import os
+import re
 import requests
 import sys
+from typing import Callable
 from dotenv import load_dotenv
 from flask import (
     Flask,
@@ -11,15 +16,27 @@ from flask import (
     request,
     session,
     abort,
+    after_this_request,
     flash,
+    g,
     make_response,
+    jsonify,
+    send_file,
     send_from_directory,
 )
-from itsdangerous import URLSafeTimedSerializer
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from markupsafe import Markup, escape
 from urllib.parse import urlencode
+from werkzeug.middleware.proxy_fix import ProxyFix
 
-from cache import DataCache
-from models import db
+from cache import DataCache, answer_slot
+from discord_api import DiscordClient
+from inputs import GeneratedInputs, InputIndex, seed_salt
+from jobs import JobQueue
+from models import db, progress_bit, unpack_progress
+from sessions import ServerSessionInterface, session_store
+from submissions import SubmissionLog
+from throttle import SubmissionLimiter
 
 # Load environment variables from .env file
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -29,6 +46,12 @@ load_dotenv(path)
 # Initialize Flask application
 app = Flask(__name__)
 # app.config["TEMPLATES_AUTO_RELOAD"] = True  # DEBUG Environment ONLY
+# Proxies in front of the app whose X-Forwarded-For/-Proto headers are trusted, so that
+# request.remote_addr is the client's address. Only set it (1 for the live site's TLS proxy)
+# when every request passes through them, or clients could pick their own address.
+PROXY_HOPS = int(os.getenv("PROXY_HOPS", "0"))
+if PROXY_HOPS:
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=PROXY_HOPS, x_proto=PROXY_HOPS)
 app.secret_key = os.getenv("SECRET_KEY")
 serializer = URLSafeTimedSerializer(app.secret_key, salt="cookie")
 
@@ -50,29 +73,156 @@ app.config['SQLALCHEMY_COMMIT_ON_TEARDOWN'] = False
 # Initialize SQLAlchemy and the Data Cache with the Flask app
 db.init_app(app)
 data_cache = DataCache(app)
+# Keep session data on the server, with only a session id in the cookie
+app.session_interface = ServerSessionInterface(session_store(app))
 
 # Load Discord OAuth credentials from environment variables
 DISCORD_CLIENT_ID = os.getenv("CLIENT_ID")
 DISCORD_CLIENT_SECRET = os.getenv("CLIENT_SECRET")
 DISCORD_REDIRECT_URI = os.getenv("DISCORD_REDIRECT_URI")
+discord_client = DiscordClient()
+job_queue = JobQueue(app)
+puzzle_inputs = InputIndex()
+generated_inputs = GeneratedInputs(seed_salt(app.secret_key))
+submission_limiter = SubmissionLimiter(app)
+submission_log = SubmissionLog(app)
 
 
-def set_progress(challenge_num: int, progress: int) -> str | None:
-    """Set the progress for a user in the database.
+# Cookie holding the signed solved mask of a user who is not logged in
+PROGRESS_COOKIE = "progress"
+# Seconds browsers may reuse a downloaded puzzle input before revalidating it
+PUZZLE_INPUT_MAX_AGE = 7 * 24 * 60 * 60
+
+
+def load_manifest(filename: str) -> dict[str, dict]:
+    """Load a manifest written by build_static.py or optimize_images.py, if that step has been run.
+
+    Args:
+        filename (str): Path of the manifest inside the static folder.
+    Returns:
+        dict: Static filename -> details of its built variants, or {} if there is no manifest.
+    """
+    try:
+        with open(os.path.join(app.static_folder, filename)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+# Static filename -> {"path": content-hashed filename, "encodings": [...]}
+STATIC_MANIFEST = load_manifest("build/manifest.json")
+# Image filename -> {"width": ..., "fallback": ..., "sources": [{"path": ..., "width": ...}, ...]}
+IMAGE_MANIFEST = load_manifest("optimized/manifest.json")
+# <img> tags in challenge HTML that point at a static image, e.g. <img class="x" src="../static/images/01/a.png"/>
+STATIC_IMG_TAG = re.compile(r'<img([^>]*?)\ssrc="\.\./static/(images/[^"]+)"([^>]*?)/?>')
+# Content-hashed filename -> original static filename
+HASHED_STATIC = {entry["path"]: filename for filename, entry in STATIC_MANIFEST.items()}
+# Hashed static URLs change whenever their content does, so they never need revalidating
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+
+def fingerprint_templates() -> str:
+    """Hash every template and the static manifests so page ETags change whenever a new version is deployed.
+
+    Returns:
+        str: Hex digest of all template files and static file hashes.
+    """
+    folder = os.path.join(app.root_path, app.template_folder)
+    digest = hashlib.sha1(json.dumps([STATIC_MANIFEST, IMAGE_MANIFEST], sort_keys=True).encode())
+    for name in sorted(os.listdir(folder)):
+        with open(os.path.join(folder, name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+TEMPLATE_VERSION = fingerprint_templates()
+
+
+def cached_page(render: Callable[[], str], *state) -> Response:
+    """Render a page with an ETag, or answer 304 Not Modified if the client already has it.
+
+    Args:
+        render (Callable[[], str]): Renders the page; only called when the client's copy is stale.
+        *state: Everything the rendered page depends on (content versions, user progress, ...).
+    Returns:
+        Response: The rendered page or an empty 304 response, with its ETag.
+    """
+    etag = hashlib.sha1(repr((TEMPLATE_VERSION, state)).encode()).hexdigest()
+    if request.if_none_match.contains(etag):
+        response = make_response("", 304)
+    else:
+        response = make_response(render())
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def anonymous_progress() -> int:
+    """Read the solved mask of a user who is not logged in from their progress cookie.
+
+    The signature is checked once per request. Progress saved by older versions, as one
+    cookie per solved part named after its signed "<week><A|B>" code, is folded into the
+    mask, and the response replaces those cookies with the single progress cookie.
+
+    Returns:
+        int: The solved mask, 0 if the user has no valid progress cookie.
+    """
+    if "anonymous_progress" in g:
+        return g.anonymous_progress
+    solved = 0
+    if token := request.cookies.get(PROGRESS_COOKIE):
+        try:
+            solved = int(serializer.loads(token))
+        except (BadSignature, TypeError, ValueError):
+            solved = 0
+    # Only cookies whose name is a validly signed code are ours; other cookies are left alone
+    g.old_progress_cookies = []
+    for name in request.cookies:
+        if len(name) <= 40:
+            continue
+        try:
+            code = serializer.loads(name)
+            solved |= progress_bit(int(code[:-1]), "AB".index(code[-1]))
+        except (BadSignature, TypeError, ValueError):
+            continue
+        g.old_progress_cookies.append(name)
+    g.anonymous_progress = solved
+    if g.old_progress_cookies:
+        save_anonymous_progress()
+    return solved
+
+
+def save_anonymous_progress() -> None:
+    """Write the solved mask in g to the progress cookie when the response is sent."""
+    if g.get("saving_progress"):
+        return
+    g.saving_progress = True
+
+    @after_this_request
+    def write_cookie(response: Response) -> Response:
+        response.set_cookie(PROGRESS_COOKIE, serializer.dumps(g.anonymous_progress), httponly=True, samesite="Lax")
+        for name in g.old_progress_cookies:
+            response.delete_cookie(name)
+        return response
+
+
+def set_progress(challenge_num: int, progress: int) -> None:
+    """Set the progress for a user in the database, or in their progress cookie if not logged in.
 
     Args:
         challenge_num (int): The challenge number.
         progress (int): The specific progress index (0 or 1).
-    Returns:
-        str | None: The serialized progress if user is not logged in, otherwise None.
     """
     if "user_data" in session:
-        # Change database and update Data Cache
-        data_cache.update_progress(session["user_data"]["id"], challenge_num, progress)
-        session["progress"] = data_cache.load_progress(session["user_data"]["id"])
+        # Change database and update Data Cache and session from the returned row
+        solved = data_cache.update_progress(session["user_data"]["id"], challenge_num, progress)
+        if solved is not None:
+            session["progress"] = solved
     else:
         # Alter Browser Cookies
-        return serializer.dumps(f"{challenge_num}{'AB'[progress]}")
+        g.anonymous_progress = anonymous_progress() | progress_bit(challenge_num, progress)
+        save_anonymous_progress()
 
 
 def get_progress() -> dict[str, str | None | list | dict[str, bool]]:
@@ -82,21 +232,22 @@ def get_progress() -> dict[str, str | None | list | dict[str, bool]]:
         dict: A dictionary containing user progress and session information.
     """
     if "user_data" in session:
-        # Retrieve information from Flask session and Data Cache
-        session["progress"] = data_cache.load_progress(session["user_data"]["id"])
+        # Retrieve information from Flask session and Data Cache, only writing the session if progress changed
+        solved = data_cache.load_progress(session["user_data"]["id"], session.get("progress")) or 0
+        if session.get("progress") != solved:
+            session["progress"] = solved
+        rockets = unpack_progress(solved)
         return {
             "id": session["user_data"]["id"],
             "img": session["user_data"]["img"],
             "text": "Logout",
             "login": "logout.html",
-            "progress": session["progress"],
-            "rockets": [session["progress"][f"c{i}"] for i in range(1, 11)],
+            "progress": {f"c{i}": pair for i, pair in enumerate(rockets, 1)},
+            "rockets": rockets,
         }
     else:
         # Retrieve information from Browser Cookies
-        cookies = [*request.cookies.keys()]
-        s = [serializer.loads(x) for x in cookies if len(x) > 40]
-        rockets = [[f"{n}{p}" in s for p in "AB"] for n in range(1, 11)]
+        rockets = unpack_progress(anonymous_progress())
         progress = {f"c{i}": pair for i, pair in enumerate(rockets, 1)}
         return {
             "id": None,
@@ -108,6 +259,56 @@ def get_progress() -> dict[str, str | None | list | dict[str, bool]]:
         }
 
 
+@app.before_request
+def sync_cache() -> None:
+    """Reload Data Cache sections that were edited through another gunicorn worker."""
+    data_cache.sync()
+
+
+@app.url_defaults
+def hashed_static_url(endpoint: str, values: dict) -> None:
+    """Point url_for('static', ...) at the content-hashed name of a file when one was built."""
+    if endpoint == "static" and (entry := STATIC_MANIFEST.get(values.get("filename"))):
+        values["filename"] = entry["path"]
+
+
+def static(filename: str) -> Response:
+    """Serve a static file, using precompressed variants and immutable caching for hashed names.
+
+    Args:
+        filename (str): Path of the file inside the static folder.
+    Returns:
+        Response: The file, its best precompressed variant for the client, or a 404.
+    """
+    original = HASHED_STATIC.get(filename)
+    if (original or filename).startswith("puzzle_input/"):
+        # Inputs are only served by get_input, which checks that their week is released
+        week, _, name = (original or filename).removeprefix("puzzle_input/").partition("/")
+        if not week.isdigit() or int(week) not in data_cache.html_nums:
+            abort(404)
+        return redirect(url_for("get_input", num=obfuscate(int(week)), filename=name), 301)
+    if original is None:
+        return app.send_static_file(filename)
+
+    path = os.path.join(app.static_folder, original)
+    encodings = STATIC_MANIFEST[original]["encodings"]
+    encoding = next((e for e in ("br", "gzip") if e in encodings and request.accept_encodings[e]), None)
+    if encoding:
+        variant = f"{filename}.{'gz' if encoding == 'gzip' else encoding}"
+        path = os.path.join(app.static_folder, "build", variant)
+    response = send_file(
+        path, mimetype=mimetypes.guess_type(original)[0], conditional=True, etag=True, max_age=IMMUTABLE_MAX_AGE
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.cache_control.immutable = True
+    return response
+
+
+app.view_functions["static"] = static
+
+
 @app.template_global()
 def obfuscate(value: str | int) -> str | int:
     """Obfuscate a value using the obfuscation database.
@@ -134,21 +335,76 @@ def obscure_post(value: str | int) -> str:
     return data_cache.obfuscations[value]
 
 
+def picture_html(filename: str, attributes: Markup) -> Markup:
+    """Wrap an <img> for a static image in a <picture> offering its optimized WebP sources.
+
+    Args:
+        filename (str): Path of the image inside the static folder.
+        attributes (Markup): Extra attributes for the <img> tag, already escaped.
+    Returns:
+        Markup: The <picture> element, or a plain <img> if the image has no optimized sources.
+    """
+    image = IMAGE_MANIFEST.get(filename)
+    src = url_for("static", filename=(image and image["fallback"]) or filename)
+    img = Markup('<img src="{}"{}>').format(src, attributes)
+    if not image or not image["sources"]:
+        return img
+    srcset = ", ".join(f"{url_for('static', filename=source['path'])} {source['width']}w" for source in image["sources"])
+    width = image["width"]
+    return Markup('<picture><source type="image/webp" srcset="{}" sizes="(max-width: {}px) 100vw, {}px">{}</picture>').format(
+        srcset, width, width, img
+    )
+
+
+@app.template_global()
+def picture(filename: str, **attrs: str) -> Markup:
+    """Render a static image as a <picture> with optimized sources for modern browsers.
+
+    Args:
+        filename (str): Path of the image inside the static folder.
+        **attrs (str): Attributes for the <img> tag (use class_ for class).
+    Returns:
+        Markup: The rendered element.
+    """
+    attributes = Markup("").join(Markup(' {}="{}"').format(k.rstrip("_"), v) for k, v in attrs.items())
+    return picture_html(filename, attributes)
+
+
+@app.template_filter()
+def pictures(html: str) -> Markup:
+    """Swap the static <img> tags in challenge HTML from the database for <picture> elements.
+
+    Args:
+        html (str): Trusted HTML content edited through the admin pages.
+    Returns:
+        Markup: The same HTML with optimized image sources.
+    """
+    def replace(match: re.Match) -> str:
+        if match[2] not in IMAGE_MANIFEST:
+            return match[0]
+        return picture_html(match[2], Markup(f"{match[1]}{match[3]}".rstrip(" /")))
+
+    return Markup(STATIC_IMG_TAG.sub(replace, html))
+
+
 @app.route("/")
-def index() -> str:
+def index() -> Response:
     """Render the index page with user progress and release number.
 
     Returns:
-        str: Rendered index.html template.
+        Response: Rendered index.html template, or 304 if unchanged.
     """
     user = get_progress()
     release = data_cache.release
-    return render_template(
-        "index.html",
-        img=user["img"],
-        text=user["text"],
-        rockets=user["rockets"],
-        num=release,
+    return cached_page(
+        lambda: render_template(
+            "index.html",
+            img=user["img"],
+            text=user["text"],
+            rockets=user["rockets"],
+            num=release,
+        ),
+        "index", release, user["img"], user["text"], user["rockets"],
     )
 
 
@@ -202,22 +458,27 @@ def callback() -> Response | tuple[str, int]:
         "client_secret": DISCORD_CLIENT_SECRET,
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = requests.post(
-        "https://discord.com/api/oauth2/token", data=token_data, headers=headers
-    )
+    try:
+        response = discord_client.post("/oauth2/token", data=token_data, headers=headers)
+        token = response.json().get("access_token")
+    except (requests.exceptions.RequestException, ValueError) as e:
+        app.logger.exception(f"Request Error (/callback): {e}")
+        return "Error: No token received", 400
 
-    if not (token := response.json()["access_token"]):
+    if not token:
         return "Error: No token received", 400
     session["token"] = token
 
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get("https://discord.com/api/users/@me", headers=headers)
+    try:
+        response = discord_client.get("/users/@me", headers=discord_client.bearer_headers(token))
+    except requests.exceptions.RequestException as e:
+        app.logger.exception(f"Request Error (/callback): {e}")
+        return "Error: No Response", 400
     if response.status_code != 200:
         return "Error: No Response", 400
 
     if not (user_data := response.json()):
         return "Error: No user data received", 400
-    session["user_data"] = user_data
 
     # Get Discord profile picture for user
     user_id = user_data["id"]
@@ -228,11 +489,12 @@ def callback() -> Response | tuple[str, int]:
         avatar_url = (
             f"https://cdn.discordapp.com/avatars/{user_id}/{avatar_hash}.{file_type}"
         )
-    session["user_data"]["img"] = avatar_url
+    # Only keep the fields the app uses
+    session["user_data"] = {"id": user_id, "username": user_data["username"], "img": avatar_url}
 
     # Add to database if not present
     session["progress"] = data_cache.load_progress(session["user_data"]["id"])
-    if not session["progress"]:
+    if session["progress"] is None:
         added = data_cache.add_user(session["user_data"]["id"], session["user_data"]["username"])
         if not added:
             return redirect(url_for("logout"))
@@ -240,31 +502,34 @@ def callback() -> Response | tuple[str, int]:
 
 
 @app.route("/challenge/<num>", methods=["GET", "POST"])
-def get_challenge(num) -> str | Response:
+def get_challenge(num) -> str | Response | tuple[str, int, dict]:
     """Render the challenge page for a specific challenge week number.
 
     Args:
         num (str): The challenge number.
     Returns:
         str: Rendered challenge.html template or error message.
-        Response: redirect to the challenge page on correct guess.
+        Response: redirect to the challenge page on correct guess, or the page with its ETag.
+        tuple[str, int, dict]: 429 with Retry-After when the client is guessing too quickly.
     """
     num = data_cache.html_nums[num]
     error = None
 
     if request.method == "POST":
+        # Turn away guessing floods before any template or progress work
+        client = f"user:{session['user_data']['id']}" if "user_data" in session else f"ip:{request.remote_addr}"
+        if not submission_limiter.allow(client, num):
+            return "Too many guesses. Please wait before trying again.", 429, {
+                "Retry-After": str(submission_limiter.retry_after())
+            }
         guesses = [request.form.get(f"answer{i}", None) for i in (1, 2)]
-        solutions = data_cache.solutions[num]
         for n, guess in enumerate(guesses):
             if guess:
-                if guess.replace("_", " ").upper().strip() == solutions[f"part{n + 1}"]:
-                    cookie = set_progress(num, n)
-                    resp = make_response(
-                        redirect(url_for("get_challenge", num=obfuscate(num)))
-                    )
-                    if cookie:
-                        resp.set_cookie(cookie, f"{num}{'AB'[n]}")
-                    return resp
+                correct = data_cache.check_answer(num, n + 1, guess, generated_answer(num, n + 1))
+                submission_log.record(client, num, n + 1, correct, data_cache.normalize_answer(guess))
+                if correct:
+                    set_progress(num, n)
+                    return redirect(url_for("get_challenge", num=obfuscate(num)))
                 else:
                     error = "Incorrect. Please try again."
 
@@ -276,77 +541,101 @@ def get_challenge(num) -> str | Response:
     except KeyError:
         return redirect(url_for("index"))
 
-    params = {
-        "img": user["img"],
-        "text": user["text"],
-        "num": f"{num}",
-        "a": a,
-        "b": b,
-        "sol1": a["solution"] if progress[0] else a["form"],
-        "sol2": b["solution"] if progress[1] else b["form"],
-        "parttwo": progress[0],
-        "done": progress[1] and "user_data" in session,
-        "error": error,
-    }
-    return render_template("challenge.html", **params)
+    # The page body only depends on the week and progress, so render it once per combination.
+    # Solved parts have a slot for their answer, which is filled in for each user.
+    done = progress[1] and "user_data" in session
+    key = (num, progress[0], progress[1], done)
+
+    def render() -> str:
+        if (body := data_cache.fragments.get(key)) is None:
+            body = render_template(
+                "challenge_body.html",
+                num=f"{num}",
+                a=a,
+                b=b,
+                sol1=a["solution"] if progress[0] else a["form"],
+                sol2=b["solution"] if progress[1] else b["form"],
+                parttwo=progress[0],
+                done=done,
+            )
+            data_cache.fragments[key] = body
+        for part, solved in enumerate(progress, 1):
+            if solved:
+                answer = generated_answer(num, part)
+                answer = data_cache.shared_answer(num, part) if answer is None else answer
+                body = body.replace(answer_slot(part), escape(answer))
+
+        params = {
+            "img": user["img"],
+            "text": user["text"],
+            "num": f"{num}",
+            "body": body,
+            "error": error,
+        }
+        return render_template("challenge.html", **params)
+
+    if error:
+        return render()
+    return cached_page(
+        render, "challenge", key, data_cache.versions.get("html"), data_cache.versions.get("solutions"),
+        user["id"], user["img"], user["text"],
+    )
+
+
+def generated_answer(num: int, part: int) -> str | None:
+    """The answer to a logged-in user's own generated input, or None if they get the shared input.
+
+    Args:
+        num (int): The challenge number.
+        part (int): The challenge part (1 or 2).
+    Returns:
+        str | None: The user's expected answer, or None.
+    """
+    if "user_data" not in session:
+        return None
+    return generated_inputs.answer(session["user_data"]["id"], num, part)
+
+
+@app.route("/input/<num>/<filename>")
+def get_input(num: str, filename: str) -> Response:
+    """Stream a puzzle input once its week has been released.
+
+    Args:
+        num (str): The obfuscated challenge number.
+        filename (str): Name of the input file, e.g. input1.txt.
+    Returns:
+        Response: The user's generated input or the shared one, honouring conditional and Range
+            requests, or a 404.
+    """
+    week = data_cache.html_nums.get(num)
+    if not isinstance(week, int):
+        abort(404)
+    if week > (data_cache.release or 0) and (get_progress()["id"] or "bad") not in data_cache.permissions:
+        abort(404)
+    if (week, filename) not in puzzle_inputs.files:
+        abort(404)
+    if "user_data" in session:
+        # Logged-in users get their own input for parts that have a generator
+        user_id = session["user_data"]["id"]
+        if response := generated_inputs.response(request, user_id, week, filename, PUZZLE_INPUT_MAX_AGE):
+            return response
+    return puzzle_inputs.response(request, week, filename, PUZZLE_INPUT_MAX_AGE)
 
 
 @app.route("/access", methods=["POST"])
 def access() -> str | tuple[str, int]:
-    """Grant access to a user and assign roles in Discord.
+    """Queue granting a user access and roles in Discord, then show the completion page.
 
     Returns:
         str: Rendered linkcomplete.html template or error message.
         tuple[str, int]: Error message with HTTP status code.
     """
-    bot_token = os.environ.get("BOT_TOKEN")
-    if not bot_token:
-        return "Error: Bot token not found", 500
-
     num = data_cache.obfuscations[f"{request.form.get('num')}"]
-
-    guild_id = data_cache.discord_ids["guild"]
     user_id = session["user_data"]["id"]
-    channel_id = data_cache.discord_ids[f"{num}"]
-    verified_role = "1173170054695764050"
-
-    headers = {"Authorization": f"Bot {bot_token}", "Content-Type": "application/json"}
-    url = f"https://discord.com/api/v9/guilds/{guild_id}/members/{user_id}"
-    response = requests.get(url, headers=headers)
-    if response.status_code == 404:  # User is not a member of the guild
-        payload = {"access_token": session["token"]}
-        url = f"https://discord.com/api/v9/guilds/{guild_id}/members/{user_id}"
-        try:
-            response = requests.put(url, headers=headers, json=payload)
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            print(f"Error: {e}")
-            return f"Error: Failed to assign role: {response.text}", 400
-        else:
-            url = f"https://discord.com/api/v9/guilds/{guild_id}/members/{user_id}/roles/{verified_role}"
-            try:
-                response = requests.put(url, headers=headers)
-                response.raise_for_status()
-            except requests.exceptions.RequestException as e:
-                return f"Error: {e}", 400
-            else:
-                if response.status_code != 204:
-                    return f"Error: Failed to assign role: {response.text}", 400
-
-    content = f"<@{user_id}> solved week {num}! If you'd like, please share how you arrived at the correct answer!"
-    url = f"https://discord.com/api/v9/channels/{channel_id}/thread-members/{user_id}"
-    response = requests.get(url, headers=headers)
 
-    if response.status_code != 200:
-        url = f"https://discord.com/api/v9/channels/{channel_id}/messages"
-        try:
-            response = requests.post(url, headers=headers, json={"content": content})
-            response.raise_for_status()
-        except requests.exceptions.RequestException as e:
-            return f"Error: {e}", 400
-        else:
-            if response.status_code != 200:
-                return f"Error: Failed to send message: {response.text}", 400
+    # Role assignment and the announcement run in the background worker
+    if not job_queue.enqueue(user_id, num, session["token"]):
+        return "Error: Failed to queue Discord access", 500
 
     user = get_progress()
     egg = data_cache.html[num]["ee"]
@@ -361,22 +650,25 @@ def access() -> str | tuple[str, int]:
 
 
 @app.route("/help")
-def help() -> str:
+def help() -> Response:
     """Render the help page.
 
     Returns:
-        str: Rendered howto.html template with user information.
+        Response: Rendered howto.html template with user information, or 304 if unchanged.
     """
     user = get_progress()
-    return render_template("howto.html", img=user["img"], text=user["text"])
+    return cached_page(
+        lambda: render_template("howto.html", img=user["img"], text=user["text"]),
+        "help", user["img"], user["text"],
+    )
 
 
 @app.route("/champions")
-def champions() -> str:
+def champions() -> Response:
     """Render the champions page.
 
     Returns:
-        str: Rendered champions.html template with user information.
+        Response: Rendered champions.html template with user information, or 304 if unchanged.
     """
     user = get_progress()
     names = []
@@ -385,7 +677,10 @@ def champions() -> str:
         names.append(champion["name"])
         links.append(champion["github"])
 
-    return render_template("champions.html", img=user["img"], text=user["text"], champions=names, githubs=links)
+    return cached_page(
+        lambda: render_template("champions.html", img=user["img"], text=user["text"], champions=names, githubs=links),
+        "champions", names, links, user["img"], user["text"],
+    )
 
 
 @app.route("/logout")
@@ -415,7 +710,9 @@ def admin() -> str | Response | tuple[str, int]:
         return f"Error: No authorization {user['id']}", 400
 
     if request.method == "GET":
-        return render_template("admin.html", img=user["img"], text=user["text"], release=data_cache.release)
+        return render_template(
+            "admin.html", img=user["img"], text=user["text"], release=data_cache.release, stats=data_cache.get_stats()
+        )
     else:
         try:
             release = min(10, max(0, int(request.form.get("release").strip())))
@@ -428,6 +725,41 @@ def admin() -> str | Response | tuple[str, int]:
         return redirect(url_for("admin"))
 
 
+@app.route("/admin/stats")
+def admin_stats() -> Response | tuple[str, int]:
+    """Report how many users solved each part of each week, from the in-memory counters.
+
+    Returns:
+        Response: JSON with the registered user count and [part 1, part 2] solves per week.
+        tuple[str, int]: Error message with HTTP status code.
+    """
+    user = get_progress()
+    if (user["id"] or "bad") not in data_cache.permissions:
+        return f"Error: No authorization {user['id']}", 400
+
+    return jsonify(data_cache.get_stats())
+
+
+@app.route("/admin/submissions")
+def admin_submissions() -> Response | tuple[str, int]:
+    """Report per-week funnels, solve times and common wrong answers from the submission log.
+
+    Returns:
+        Response: JSON of the aggregates, plus how many submissions this worker dropped.
+        tuple[str, int]: Error message with HTTP status code.
+    """
+    user = get_progress()
+    if (user["id"] or "bad") not in data_cache.permissions:
+        return f"Error: No authorization {user['id']}", 400
+
+    return jsonify(
+        funnel=submission_log.funnel(),
+        solve_times=submission_log.solve_times(),
+        wrong_answers=submission_log.wrong_answers(),
+        dropped=submission_log.dropped,
+    )
+
+
 @app.route("/update-html", methods=["GET", "POST"])
 def update_html() -> str | Response | tuple[str, int]:
     """Render the update HTML page or process update HTML requests.
@@ -449,7 +781,7 @@ def update_html() -> str | Response | tuple[str, int]:
         return redirect(url_for('update_html'))
 
     try:
-        data = data_cache.html[week]
+        data = data_cache.get_html(week)
         a, b, ee = data[1], data[2], data["ee"]
     except KeyError:
         return redirect(url_for("update-html"))
@@ -580,7 +912,7 @@ def edit_solutions() -> str | Response | tuple[str, int]:
         return f"Error: No authorization {user['id']}", 400
 
     if request.method == "GET":
-        solutions = data_cache.solutions
+        solutions = data_cache.get_solutions()
 
         params = {
             "img": user["img"],
@@ -0,0 +1,106 @@
+"""Benchmark the Discord client against a local fake Discord API with a simulated rate limit.
+
+Usage: python benchmarks/discord_rate_limit.py [calls] [limit] [window]
+
+The fake server allows `limit` calls per `window` seconds on a single bucket and answers
+429 with Discord's rate limit headers once the bucket is empty. The report shows how many
+calls succeeded, how many 429s the server had to send, and the overall throughput.
+"""
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from discord_api import DiscordClient  # noqa: E402
+
+
+class FakeDiscord(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, limit: int, window: float):
+        super().__init__(("127.0.0.1", 0), FakeDiscordHandler)
+        self.limit = limit
+        self.window = window
+        self.lock = threading.Lock()
+        self.remaining = limit
+        self.reset = time.monotonic() + window
+        self.served = 0
+        self.rejected = 0
+
+    def take(self) -> tuple[bool, int, float]:
+        """Take a call from the bucket. Returns (allowed, remaining, reset_after)."""
+        with self.lock:
+            now = time.monotonic()
+            if now >= self.reset:
+                self.remaining = self.limit
+                self.reset = now + self.window
+            if self.remaining <= 0:
+                self.rejected += 1
+                return False, 0, self.reset - now
+            self.remaining -= 1
+            self.served += 1
+            return True, self.remaining, self.reset - now
+
+
+class FakeDiscordHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def handle_call(self) -> None:
+        if length := int(self.headers.get("Content-Length", 0)):
+            self.rfile.read(length)
+        allowed, remaining, reset_after = self.server.take()
+        if allowed:
+            status, body = 200, {"id": "1"}
+        else:
+            status, body = 429, {"message": "You are being rate limited.", "retry_after": reset_after, "global": False}
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("X-RateLimit-Bucket", "fakebucket")
+        self.send_header("X-RateLimit-Limit", str(self.server.limit))
+        self.send_header("X-RateLimit-Remaining", str(remaining))
+        self.send_header("X-RateLimit-Reset-After", f"{reset_after:.3f}")
+        if not allowed:
+            self.send_header("X-RateLimit-Scope", "user")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_PUT = do_POST = handle_call
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    window = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+
+    server = FakeDiscord(limit, window)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    client = DiscordClient(base_url=f"http://127.0.0.1:{server.server_port}")
+
+    start = time.perf_counter()
+    futures = [
+        client.submit("POST", "/v9/channels/900302240559018015/messages", json={"content": f"{i}"})
+        for i in range(calls)
+    ]
+    statuses = [future.result().status_code for future in futures]
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    ok = statuses.count(200)
+    print(f"Simulated limit:  {limit} calls / {window:g}s")
+    print(f"Calls succeeded:  {ok}/{calls}")
+    print(f"429s from server: {server.rejected}")
+    print(f"Elapsed:          {elapsed:.2f}s")
+    print(f"Throughput:       {ok / elapsed:.1f} calls/s (ceiling {limit / window:.1f} calls/s)")
+
+
+if __name__ == "__main__":
+    main()
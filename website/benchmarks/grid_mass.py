@@ -0,0 +1,73 @@
+"""Benchmark the NumPy week 4 solvers against the pure Python ones on large synthetic inputs.
+
+Usage: python benchmarks/grid_mass.py [size ...]
+
+Needs NumPy. For each size, builds a square concentration grid of that many cells a side,
+scattered with winding clusters like 04/input2.txt, and a Center of Flavor input with that
+many lines of blooms. Times both solvers on each, parsing included, and checks they agree.
+Sizes default to 200 (the size of the real grid), 400, 800 and 1600.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from solvers import VECTORIZED_SOLVERS, week04  # noqa: E402
+
+SIZES = (200, 400, 800, 1600)
+# Cells per cluster, on average, and the share of the grid clusters are started on
+CLUSTER_CELLS = 60
+CLUSTER_DENSITY = 0.008
+SEED = 4
+
+
+def synthetic_grid(size: int, rng: random.Random) -> str:
+    """A size x size grid of zeros with random-walk clusters of concentrations from 1 to 9."""
+    grid = [[0] * size for _ in range(size)]
+    for _ in range(int(size * size * CLUSTER_DENSITY)):
+        x, y = rng.randrange(size), rng.randrange(size)
+        for _ in range(rng.randint(CLUSTER_CELLS // 2, CLUSTER_CELLS * 3 // 2)):
+            grid[y][x] = rng.randint(1, 9)
+            dx, dy = rng.choice(((1, 0), (-1, 0), (0, 1), (0, -1)))
+            x, y = min(max(x + dx, 0), size - 1), min(max(y + dy, 0), size - 1)
+    return "\n".join(",".join(map(str, row)) for row in grid)
+
+
+def synthetic_blooms(lines: int, rng: random.Random) -> str:
+    """Lines of three m(x,y) blooms with coordinates that keep every center printable."""
+    return "\n".join(
+        " ".join(f"{rng.randint(1, 30)}({rng.randint(48, 122)},{rng.randint(48, 122)})" for _ in range(3))
+        for _ in range(lines)
+    )
+
+
+def timed(function, puzzle_input: str) -> tuple[str, float]:
+    start = time.perf_counter()
+    answer = function(puzzle_input)
+    return answer, time.perf_counter() - start
+
+
+def main():
+    if not VECTORIZED_SOLVERS:
+        sys.exit("NumPy is not installed.")
+    sizes = [int(size) for size in sys.argv[1:]] or SIZES
+    rng = random.Random(SEED)
+
+    print(f"{'input':>22}  {'python s':>9} {'numpy s':>8} {'speedup':>8}")
+    for size in sizes:
+        for label, puzzle_input, part, solver in (
+            (f"{size}x{size} grid", synthetic_grid(size, rng), 2, week04.center_of_mass),
+            (f"{size * size // 100} bloom lines", synthetic_blooms(size * size // 100, rng), 1, week04.center_of_flavor),
+        ):
+            python_answer, python_seconds = timed(solver, puzzle_input)
+            numpy_answer, numpy_seconds = timed(VECTORIZED_SOLVERS[(4, part)], puzzle_input)
+            line = f"{label:>22}  {python_seconds:>9.3f} {numpy_seconds:>8.3f} {python_seconds / numpy_seconds:>7.1f}x"
+            if python_answer != numpy_answer:
+                line += "  answers differ"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
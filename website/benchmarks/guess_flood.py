@@ -0,0 +1,77 @@
+"""Benchmark how many challenge POSTs a worker handles during a flood of wrong guesses.
+
+Usage: python benchmarks/guess_flood.py [seconds] [threads] [week]
+
+Needs the database from .env, like the app itself. The flood runs twice through Flask's test
+client, in-process like a gunicorn worker: once with the submission limiter effectively
+disabled, so every guess is checked and the page is rendered, and once with the default limits,
+so all but the first burst of guesses are turned away early with a 429. Each client floods from
+its own IP address. Submission logging is turned off for the run, and the limiter's and any
+logged submissions' rows for those addresses are deleted afterwards.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app import app, data_cache, submission_limiter, submission_log  # noqa: E402
+from models import db, Submission, SubmissionLimit  # noqa: E402
+
+
+def flood(seconds: float, threads: int, week: int) -> tuple[Counter, float]:
+    """POST wrong guesses from `threads` clients for `seconds`. Returns the status counts and elapsed time."""
+    url = f"/challenge/{data_cache.html_nums[week]}"
+    statuses = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(n: int) -> None:
+        test_client = app.test_client()
+        environ = {"REMOTE_ADDR": f"198.51.100.{n}"}
+        seen = Counter()
+        while time.perf_counter() < deadline:
+            response = test_client.post(url, data={"answer1": "NOT IT"}, environ_base=environ)
+            seen[response.status_code] += 1
+        with lock:
+            statuses.update(seen)
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=client, args=(n,)) for n in range(1, threads + 1)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return statuses, time.perf_counter() - start
+
+
+def clear(threads: int) -> None:
+    with app.app_context():
+        clients = [f"ip:198.51.100.{n}" for n in range(1, threads + 1)]
+        SubmissionLimit.query.filter(SubmissionLimit.client.in_(clients)).delete(synchronize_session=False)
+        Submission.query.filter(Submission.client.in_(clients)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    week = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+    capacity = submission_limiter.capacity
+    # Keep the fake guesses out of the submission stats
+    submission_log.record = lambda *args: None
+    for label, limit in (("unlimited", 10**9), ("limited", capacity)):
+        clear(threads)
+        submission_limiter.capacity = limit
+        statuses, elapsed = flood(seconds, threads, week)
+        total = sum(statuses.values())
+        print(f"{label:>9}: {total / elapsed:8.1f} requests/s  {dict(sorted(statuses.items()))}")
+    submission_limiter.capacity = capacity
+    clear(threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Profile how much each puzzle input rewards a better algorithm than the naive one.
+
+Usage: python benchmarks/puzzle_difficulty.py [timeout] [week ...]
+
+For every part with a naive solver in solvers/, the naive and the reference solver are run
+on the shared input from static/puzzle_input/ and on copies enlarged SCALES times, each in a
+child process that is killed after `timeout` seconds (10 by default). For each run it prints
+the time taken, the naive/reference ratio and peak traced memory, then how fast each solver's
+time grows with the input. The shared input is flagged when the naive solver finishes in under
+TOO_FAST seconds, so the puzzle doesn't reward doing better, or when it blows up by timing out.
+"""
+import math
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, NamedTuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from solvers import ENLARGERS, NAIVE_SOLVERS, SOLVERS, input_path, read_input  # noqa: E402
+
+# Sizes the shared input is enlarged to, as multiples of the original
+SCALES = (1, 2, 4, 8)
+# Naive solvers that finish the shared input faster than this, in seconds, make the puzzle too easy
+TOO_FAST = 1.0
+# Child processes are forked so solvers and inputs don't need to be pickled
+CONTEXT = multiprocessing.get_context("fork")
+
+
+class Run(NamedTuple):
+    answer: str
+    seconds: float
+    peak: int | None  # bytes, None if tracing didn't finish in time
+
+
+def main():
+    timeout = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    weeks = {int(week) for week in sys.argv[2:]}
+
+    for week, part in sorted(NAIVE_SOLVERS):
+        if weeks and week not in weeks:
+            continue
+        print(f"Week {week} part {part}")
+        print(f"{'scale':>6}  {'reference s':>11} {'naive s':>9} {'ratio':>7}  {'reference KiB':>13} {'naive KiB':>9}")
+        puzzle_input = read_input(input_path(week, part))
+        reference, naive = {}, {}
+        for i, scale in enumerate(SCALES):
+            enlarged = ENLARGERS[(week, part)](puzzle_input, scale) if scale > 1 else puzzle_input
+            reference[scale] = measure(SOLVERS[(week, part)].function, enlarged, timeout)
+            # Once the naive solver has timed out, larger inputs won't go any better
+            if i == 0 or naive[SCALES[i - 1]] is not None:
+                naive[scale] = measure(NAIVE_SOLVERS[(week, part)], enlarged, timeout)
+            else:
+                naive[scale] = None
+            print(row(scale, reference[scale], naive[scale]))
+
+        print(f"  growth: reference {growth(reference)}, naive {growth(naive)}")
+        print(f"  {verdict(naive[1], timeout)}")
+        print()
+
+
+def measure(function: Callable, puzzle_input: str, timeout: float) -> Run | None:
+    """Solve in a child process: once timed, then again with tracemalloc for peak memory.
+
+    Each run gets `timeout` seconds. Returns None if the timed run doesn't finish in time.
+    """
+    receiver, sender = CONTEXT.Pipe(duplex=False)
+    process = CONTEXT.Process(target=solve, args=(function, puzzle_input, sender), daemon=True)
+    process.start()
+    sender.close()
+    results = []
+    try:
+        while len(results) < 2 and receiver.poll(timeout):
+            results.append(receiver.recv())
+    except EOFError:
+        pass
+    finally:
+        process.kill()
+        process.join()
+    if not results:
+        return None
+    if isinstance(results[0], Exception):
+        raise results[0]
+    answer, seconds = results[0]
+    return Run(answer, seconds, results[1] if len(results) > 1 else None)
+
+
+def solve(function: Callable, puzzle_input: str, sender) -> None:
+    try:
+        start = time.perf_counter()
+        answer = function(puzzle_input)
+        sender.send((answer, time.perf_counter() - start))
+        tracemalloc.start()
+        function(puzzle_input)
+        sender.send(tracemalloc.get_traced_memory()[1])
+    except Exception as e:
+        sender.send(e)
+
+
+def row(scale: int, reference: Run | None, naive: Run | None) -> str:
+    def seconds(run: Run | None) -> str:
+        return f"{run.seconds:.3f}" if run else "timeout"
+
+    def kib(run: Run | None) -> str:
+        return f"{run.peak / 1024:,.0f}" if run and run.peak is not None else "-"
+
+    ratio = f"{naive.seconds / reference.seconds:.1f}x" if naive and reference and reference.seconds else "-"
+    line = f"{scale:>5}x  {seconds(reference):>11} {seconds(naive):>9} {ratio:>7}  {kib(reference):>13} {kib(naive):>9}"
+    if naive and reference and naive.answer != reference.answer:
+        line += f"  answers differ: {reference.answer!r} vs {naive.answer!r}"
+    return line
+
+
+def growth(runs: dict[int, Run | None]) -> str:
+    """How time grows with the input, as the exponent k of n^k between the smallest and largest finished scale."""
+    finished = [scale for scale, run in runs.items() if run]
+    if len(finished) < 2 or not runs[finished[0]].seconds:
+        return "unknown" if finished else "times out"
+    first, last = finished[0], finished[-1]
+    exponent = math.log(runs[last].seconds / runs[first].seconds) / math.log(last / first)
+    timed_out = [scale for scale, run in runs.items() if not run]
+    timed_out = f", times out from {timed_out[0]}x" if timed_out else ""
+    return f"~n^{exponent:.1f}{timed_out}"
+
+
+def verdict(naive: Run | None, timeout: float) -> str:
+    if naive is None:
+        return f"BLOWS UP: the naive solver doesn't finish the shared input in {timeout:g}s"
+    if naive.seconds < TOO_FAST:
+        return f"TOO FAST: the naive solver finishes the shared input in {naive.seconds:.3f}s"
+    return f"ok: the naive solver needs {naive.seconds:.1f}s for the shared input"
+
+
+if __name__ == "__main__":
+    main()
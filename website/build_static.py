@@ -0,0 +1,91 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+BUILD_DIR = os.path.join(STATIC_DIR, "build")
+MANIFEST = os.path.join(BUILD_DIR, "manifest.json")
+# Puzzle inputs are served by the app's input route, not as static files
+SKIPPED_DIRS = {BUILD_DIR, os.path.join(STATIC_DIR, "puzzle_input")}
+# Only text formats are precompressed; images and fonts are already compressed
+COMPRESSIBLE = {".txt", ".css", ".js", ".svg", ".ico", ".html", ".json"}
+# Variants that save less than this fraction of the original are not kept
+MIN_SAVING = 0.05
+
+
+def main():
+    """Write content-hashed names and precompressed variants of every static file.
+
+    Usage: python build_static.py [--clean]
+    """
+    if "--clean" in sys.argv[1:] and os.path.isdir(BUILD_DIR):
+        shutil.rmtree(BUILD_DIR)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    if brotli is None:
+        print("brotli is not installed; only gzip variants will be written.")
+
+    manifest = {}
+    original_size = compressed_size = 0
+    for filename in sorted(static_files()):
+        with open(os.path.join(STATIC_DIR, filename), "rb") as f:
+            data = f.read()
+        hashed = hashed_name(filename, data)
+        entry = {"path": hashed, "encodings": []}
+        if os.path.splitext(filename)[1].lower() in COMPRESSIBLE:
+            for encoding, compress in compressors():
+                variant = compress(data)
+                if len(variant) <= len(data) * (1 - MIN_SAVING):
+                    write_variant(hashed, encoding, variant)
+                    entry["encodings"].append(encoding)
+                    if encoding == "gzip":
+                        original_size += len(data)
+                        compressed_size += len(variant)
+        manifest[filename] = entry
+
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    print(f"Hashed {len(manifest)} static files into {os.path.relpath(MANIFEST)}.")
+    if original_size:
+        print(f"gzip: {original_size:,} -> {compressed_size:,} bytes for compressible files.")
+
+
+def static_files() -> list[str]:
+    """Relative paths of all static files outside the build and puzzle input directories."""
+    files = []
+    for root, dirs, names in os.walk(STATIC_DIR):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) not in SKIPPED_DIRS]
+        for name in names:
+            files.append(os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, "/"))
+    return files
+
+
+def hashed_name(filename: str, data: bytes) -> str:
+    """Insert a short content hash before the extension, e.g. style/style.1a2b3c4d5e.css"""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def compressors():
+    """Available (encoding, compress function) pairs, using maximum compression since this runs offline."""
+    yield "gzip", lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield "br", lambda data: brotli.compress(data, quality=11)
+
+
+def write_variant(hashed: str, encoding: str, data: bytes) -> None:
+    path = os.path.join(BUILD_DIR, f"{hashed}.{'gz' if encoding == 'gzip' else encoding}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,18 @@
+import hashlib
+import hmac
+import html as html_escapes
+import re
 import sys
+import time
+from collections import OrderedDict
 from flask import Flask, flash
+from markupsafe import Markup
+from sqlalchemy import and_, case, func, update
 
 from models import (
     db,
+    CACHE_SECTIONS,
+    CacheVersion,
     DiscordID,
     MainEntry,
     SubEntry,
@@ -11,21 +21,106 @@ from models import (
     Solution,
     Permissions,
     Release,
+    SolveStat,
+    ALL_SOLVED,
+    WEEKS,
+    progress_bit,
 )
 
+# Maximum number of users whose progress is held in memory per worker
+PROGRESS_CACHE_SIZE = 2048
+# Seconds between checks of the shared version row for edits made by other workers
+SYNC_INTERVAL = 2.0
+# Spans in a solved part's "Your answer was ..." HTML; the one showing the part's answer gets a slot
+ANSWER_SPAN = re.compile(r"(<span\b[^>]*>)\s*([^<]*?)\s*(</span>)")
+
+
+def answer_slot(part: int) -> str:
+    """Placeholder for a part's answer in shared rendered HTML, filled in for each user."""
+    return f"<!--answer{part}-->"
+
 
 class DataCache:
     def __init__(self, app: Flask):
         self.app = app
+        self.progress = OrderedDict()
         self.discord_ids = {}
         self.html = {}
         self.obfuscations = {}
         self.html_nums = {}
-        self.solutions = {}
+        self.solution_hashes = {}  # week -> {"part1": digest, "part2": digest} of normalized answers
+        self.shown_answers = {}  # (week, part) -> answer as written in the solution HTML, cut out of it
         self.permissions = []
         self.release = None
+        self.champions = []
+        self.solve_counts = {}  # (week, part) -> users who solved it; (0, 0) -> registered users
+        self.fragments = {}  # (week, part 1 solved, part 2 solved, done) -> rendered challenge body
+        self.last_sync = 0.0
+        self.loaders = {
+            "release": self.load_release,
+            "constants": self.load_admin_constants,
+            "solutions": self.load_solutions,
+            "html": self.load_html,
+            "champions": self.load_champions,
+        }
+        self.versions = self.fetch_versions()
         self.load_constants()
         self.load_html()
+        self.load_champions()
+        self.load_stats()
+
+    def fetch_versions(self) -> dict[str, int]:
+        """Read the shared version counter of every cached section from the database."""
+        with self.app.app_context():
+            versions = CacheVersion.query.with_entities(CacheVersion.section, CacheVersion.version).all()
+            return {section: version for section, version in versions}
+
+    def bump_version(self, section: str) -> None:
+        """Increment the shared version of a section within the current transaction.
+
+        Other workers see the new version on their next sync and reload that section.
+        This worker only adopts the new version if no other worker bumped it in between,
+        otherwise the next sync reloads the section to pick up the other edit as well.
+        """
+        version = db.session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.section == section)
+            .values(version=CacheVersion.version + 1)
+            .returning(CacheVersion.version)
+        ).scalar()
+        if version is not None and version == self.versions.get(section, 0) + 1:
+            self.versions[section] = version
+
+    def sync(self) -> None:
+        """Reload any section whose shared version changed since this worker last loaded it.
+
+        Runs at most once every SYNC_INTERVAL seconds so the version check costs a single
+        small query per interval rather than one per request. The solve counters change with
+        every solve, so rather than being versioned they are simply reloaded on each check.
+        """
+        now = time.monotonic()
+        if now - self.last_sync < SYNC_INTERVAL:
+            return
+        self.last_sync = now
+        try:
+            versions = self.fetch_versions()
+        except Exception as e:
+            self.app.logger.exception(f"Failed to check cache versions: {e}")
+            return
+        for section in CACHE_SECTIONS:
+            if versions.get(section, 0) != self.versions.get(section, 0):
+                self.app.logger.info(f"Reloading {section} after change in another worker.")
+                try:
+                    self.loaders[section]()
+                except Exception as e:
+                    # Keep the old version so the next sync tries again
+                    self.app.logger.exception(f"Failed to reload {section}: {e}")
+                    continue
+                self.versions[section] = versions.get(section, 0)
+        try:
+            self.load_stats()
+        except Exception as e:
+            self.app.logger.exception(f"Failed to reload solve counts: {e}")
 
     def load_constants(self) -> None:
         """Load all pseudo-constant data from the database into memory."""
@@ -38,13 +133,56 @@ class DataCache:
             self.html_nums = {i: o for i, o in html_nums}
             self.html_nums |= {o: i for i, o in html_nums}
 
-            # Admin-Managed Constants
+        # Admin-Managed Constants
+        self.load_admin_constants()
+        self.load_solutions()
+        self.load_release()
+
+    def load_admin_constants(self) -> None:
+        """Load Discord IDs and admin permissions from the database into memory."""
+        with self.app.app_context():
             discord_ids = DiscordID.query.with_entities(DiscordID.name, DiscordID.discord_id).all()
             self.discord_ids = {name: i for name, i in discord_ids}
             permissions = Permissions.query.with_entities(Permissions.user_id).all()
             self.permissions = [permission[0] for permission in permissions]
+
+    def load_solutions(self) -> None:
+        """Load keyed hashes of the challenge solutions into memory; the plaintext is not kept.
+
+        Once the HTML is loaded, it is reloaded too, so each answer slot follows its solution.
+        """
+        with self.app.app_context():
             solutions = Solution.query.with_entities(Solution.id, Solution.part1, Solution.part2).all()
-            self.solutions = {i: {"part1": a, "part2": b} for i, a, b in solutions}
+            self.solution_hashes = {
+                i: {"part1": self.hash_answer(a), "part2": self.hash_answer(b)} for i, a, b in solutions
+            }
+        if self.html:
+            self.load_html()
+
+    def get_solutions(self) -> dict[int, dict[str, str]]:
+        """Read the plaintext solutions from the database for the admin editor."""
+        with self.app.app_context():
+            solutions = Solution.query.with_entities(Solution.id, Solution.part1, Solution.part2).all()
+            return {i: {"part1": a, "part2": b} for i, a, b in solutions}
+
+    @staticmethod
+    def normalize_answer(answer: str) -> str:
+        """Normalize an answer or guess so formatting differences don't matter."""
+        return answer.replace("_", " ").upper().strip()
+
+    def hash_answer(self, answer: str) -> bytes:
+        """HMAC of an answer keyed with the app secret, after the same normalization applied to guesses."""
+        normalized = self.normalize_answer(answer)
+        return hmac.new(self.app.secret_key.encode(), normalized.encode(), hashlib.sha256).digest()
+
+    def check_answer(self, week: int, part: int, guess: str, answer: str | None = None) -> bool:
+        """Compare a guess with the stored solution (or with `answer`, when given) in constant time."""
+        expected = self.hash_answer(answer) if answer is not None else self.solution_hashes[week][f"part{part}"]
+        return hmac.compare_digest(self.hash_answer(guess), expected)
+
+    def load_release(self) -> None:
+        """Load the release week from the database into memory."""
+        with self.app.app_context():
             self.release = Release.query.first().release
 
     def update_release(self, release: int) -> bool:
@@ -57,6 +195,7 @@ class DataCache:
                     modified = True
                     release_record.release = release
                     self.release = release
+                    self.bump_version("release")
 
                 db.session.commit()
 
@@ -98,6 +237,8 @@ class DataCache:
                     modified = True
                     db.session.add(Permissions(user_id=user_id))
                 self.permissions = permitted
+                if modified:
+                    self.bump_version("constants")
 
                 db.session.commit()
 
@@ -114,15 +255,65 @@ class DataCache:
 
         return True
 
-    def load_html(self) -> None:
-        """Load html content from the database into memory."""
+    def load_html(self, week: int | None = None) -> None:
+        """Load html content from the database into memory with one joined query.
+
+        Loads every week, or only `week` if given. The span showing the answer in each part's
+        solution HTML is emptied into answer_slot(part), so the cached HTML and rendered pages
+        never hold an answer. The span's text is kept in `shown_answers` for users without a
+        generated input.
+        """
+        html = self.query_html(week)
+        with self.app.app_context():
+            query = Solution.query.with_entities(Solution.id, Solution.part1, Solution.part2)
+            if week is not None:
+                query = query.filter(Solution.id == week)
+            solutions = {i: (a, b) for i, a, b in query.all()}
+        shown_answers = {}
+        for i, entry in html.items():
+            for part in (1, 2):
+                if part in entry and i in solutions:
+                    entry[part]["solution"], shown = self.cut_answer(entry[part]["solution"], part, solutions[i][part - 1])
+                    if shown is None:
+                        self.app.logger.warning(f"Week {i} part {part} solution HTML does not show its answer.")
+                    else:
+                        shown_answers[(i, part)] = shown
+        if week is None:
+            self.html = html
+            self.shown_answers = shown_answers
+        else:
+            self.html.update(html)
+            self.shown_answers = {key: shown for key, shown in self.shown_answers.items() if key[0] != week}
+            self.shown_answers |= shown_answers
+        self.fragments.clear()
+
+    def cut_answer(self, solution: str, part: int, answer: str) -> tuple[str, str | None]:
+        """Replace the text of the span showing `answer` in solution HTML with answer_slot(part).
+
+        Returns the HTML and the span's text as written, or the HTML unchanged and None if no
+        span shows the answer.
+        """
+        expected = self.normalize_answer(answer)
+        for match in ANSWER_SPAN.finditer(solution):
+            if self.normalize_answer(html_escapes.unescape(match[2])) == expected:
+                cut = f"{solution[:match.start()]}{match[1]}{answer_slot(part)}{match[3]}{solution[match.end():]}"
+                return cut, match[2]
+        return solution, None
+
+    def query_html(self, week: int | None = None) -> dict[int, dict]:
+        """Read the html content of every week, or only `week`, as stored in the database."""
         with self.app.app_context():
-            main_entries = MainEntry.query.all()
-            for main_entry in main_entries:
-                self.html[main_entry.id] = {}
-                sub_entries = SubEntry.query.filter_by(main_entry_id=main_entry.id).all()
-                for sub_entry in sub_entries:
-                    self.html[main_entry.id][sub_entry.sub_entry_id] = {
+            query = (
+                db.session.query(MainEntry.id, MainEntry.ee, SubEntry)
+                .outerjoin(SubEntry, SubEntry.main_entry_id == MainEntry.id)
+            )
+            if week is not None:
+                query = query.filter(MainEntry.id == week)
+            html = {}
+            for main_entry_id, ee, sub_entry in query.all():
+                html.setdefault(main_entry_id, {"ee": ee})
+                if sub_entry is not None:
+                    html[main_entry_id][sub_entry.sub_entry_id] = {
                         "title": sub_entry.title,
                         "content": sub_entry.content,
                         "instructions": sub_entry.instructions,
@@ -130,7 +321,15 @@ class DataCache:
                         "form": sub_entry.form,
                         "solution": sub_entry.solution
                     }
-                self.html[main_entry.id]["ee"] = main_entry.ee
+        return html
+
+    def get_html(self, week: int) -> dict:
+        """Read a week's html content, answers included, from the database for the admin editor."""
+        return self.query_html(week)[week]
+
+    def shared_answer(self, week: int, part: int) -> Markup:
+        """The answer shown on a solved part to users without a generated input, as the admin wrote it."""
+        return Markup(self.shown_answers.get((week, part), ""))
 
     @staticmethod
     def normalize(s: str) -> str:
@@ -139,9 +338,10 @@ class DataCache:
 
     def update_html(self, week: int, a: dict[str, str], b: dict[str, str], ee: str) -> bool:
         """Update a SubEntry in the database with new data if changed"""
-        part1 = self.count_changes(week, 1, a)
-        part2 = self.count_changes(week, 2, b)
-        egg_change = int(ee != self.html[week]["ee"])
+        current = self.get_html(week)
+        part1 = self.count_changes(current[1], a)
+        part2 = self.count_changes(current[2], b)
+        egg_change = int(ee != current["ee"])
 
         if part1 == 0 and part2 == 0 and egg_change == 0:
             flash("No changes made.", "success")
@@ -157,14 +357,15 @@ class DataCache:
                         sub_entry = SubEntry.query.filter_by(main_entry_id=week, sub_entry_id=part).first()
                         for data_field, db_field in zip(data_fields, db_fields):
                             fixed = self.normalize(data[data_field])
-                            if fixed != self.html[week][part][data_field]:
+                            if fixed != current[part][data_field]:
                                 setattr(sub_entry, db_field, fixed)
                     if egg_change:
                         entry = MainEntry.query.filter_by(id=week).first()
                         entry.ee = ee
+                    self.bump_version("html")
                     db.session.commit()
                 flash(f"Database for Week {week} Successfully Updated!", "success")
-                self.load_html()
+                self.load_html(week)
             except Exception as e:
                 flash(f"Update failed: {str(e)}", "error")
                 self.app.logger.exception(f"Update HTML failed: {str(e)}")
@@ -172,54 +373,104 @@ class DataCache:
                 return False
         return True
 
-    def count_changes(self, week: int, part: int, data: dict[str, str]) -> int:
-        """Update Part 1 or 2 of SubEntry in the database and return how many changes were made"""
+    def count_changes(self, current: dict[str, str], data: dict[str, str]) -> int:
+        """Count the fields of Part 1 or 2 of a SubEntry that differ from the data submitted"""
         fields = ["title", "content", "instructions", "input", "form", "solution"]
-        return sum(self.normalize(data[field]) != self.html[week][part][field] for field in fields)
-
-
-    def load_progress(self, user_id: str) -> dict:
-        """Query user progress from the database. Returns a dict if found, else an empty dict."""
+        return sum(self.normalize(data[field]) != current[field] for field in fields)
+
+    def cache_progress(self, user_id: str, solved: int) -> None:
+        """Store a user's solved mask in the LRU cache, evicting the least recently used user if full."""
+        self.progress[user_id] = solved
+        self.progress.move_to_end(user_id)
+        while len(self.progress) > PROGRESS_CACHE_SIZE:
+            self.progress.popitem(last=False)
+
+    def load_progress(self, user_id: str, seen: int | None = None) -> int | None:
+        """Get a user's solved mask from the cache, else the database. Returns None if the user is not found.
+
+        Progress only ever moves forward, so if `seen` (the mask last stored in the user's
+        session) has a bit the cached copy lacks, the entry is stale from a write in another
+        worker and is reloaded.
+        """
+        if user_id in self.progress:
+            if not isinstance(seen, int) or not seen & ~self.progress[user_id]:
+                self.progress.move_to_end(user_id)
+                return self.progress[user_id]
         with self.app.app_context():
             try:
-                progress = Progress.query.filter_by(user_id=user_id).first()
-                if progress is None:
+                solved = Progress.query.with_entities(Progress.solved).filter_by(user_id=user_id).scalar()
+                if solved is None:
                     self.app.logger.warning(f"User {user_id} not found in database when loading data.")
-                    return {}
-                return {k: v for k, v in progress.__dict__.items() if k != "_sa_instance_state"}
+                    return None
             except Exception as e:
                 self.app.logger.exception(f"Failed to load progress for user {user_id}")
-                return {}
-
-    def update_progress(self, user_id: str, challenge_num: int, index: int) -> bool:
-        """Update individual user progress in the database and refresh the cache."""
+                return None
+        self.cache_progress(user_id, solved)
+        return solved
+
+    def update_progress(self, user_id: str, challenge_num: int, index: int) -> int | None:
+        """Set one bit of a user's solved mask in a single statement and refresh the cache.
+
+        The bit is OR-ed in by the database, so concurrent solves by the same user cannot
+        overwrite each other, and the finish time is stamped in the same statement when the
+        mask becomes complete. The row is only updated if the bit was not already set, so the
+        solve counter is incremented exactly once per user and part.
+        Returns the new mask, or None if the update failed.
+        """
+        bit = progress_bit(challenge_num, index)
+        solved = Progress.solved.op("|")(bit)
+        finished_now = and_(Progress.completed_at.is_(None), solved == ALL_SOLVED)
         with self.app.app_context():
-            progress = Progress.query.filter_by(user_id=user_id).first()
-            if progress is None:
-                self.app.logger.warning(f"User {user_id} not found in database when updating data.")
-                return False
-            challenge = getattr(progress, f"c{challenge_num}", None)
-            if challenge is None or not isinstance(challenge, list):
-                self.app.logger.warning(f"Unexpected error with updating challenge. {progress=} {challenge=}")
-                return False
-            challenge = challenge[:index] + [True] + challenge[index + 1:]
-            setattr(progress, f"c{challenge_num}", challenge)
-            db.session.commit()
-        return True
-
+            try:
+                row = db.session.execute(
+                    update(Progress)
+                    .where(Progress.user_id == user_id, Progress.solved.op("&")(bit) == 0)
+                    .values(
+                        solved=solved,
+                        completed_at=case((finished_now, func.now()), else_=Progress.completed_at),
+                    )
+                    .returning(
+                        Progress.solved,
+                        Progress.name,
+                        Progress.github,
+                        (Progress.completed_at == func.now()).label("new_champion"),
+                    )
+                ).first()
+                if row is None:
+                    # Either the part was already solved or the user does not exist
+                    db.session.rollback()
+                    current = Progress.query.with_entities(Progress.solved).filter_by(user_id=user_id).scalar()
+                    if current is None:
+                        self.app.logger.warning(f"User {user_id} not found in database when updating data.")
+                        return None
+                    self.cache_progress(user_id, current)
+                    return current
+                if row.new_champion:
+                    self.bump_version("champions")
+                solves = self.increment_stat(challenge_num, index + 1)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                self.app.logger.exception(f"Failed to update progress for user {user_id}: {e}")
+                return None
+        if row.new_champion:
+            self.champions.append({"name": row.name, "github": row.github})
+        if solves is not None:
+            self.solve_counts[(challenge_num, index + 1)] = solves
+        self.cache_progress(user_id, row.solved)
+        return row.solved
 
     def add_user(self, user_id: str, name: str) -> bool:
         """Insert a new progress record into the database."""
         try:
             with self.app.app_context():
-                new_progress = Progress(
-                    user_id=user_id,
-                    name=name,
-                    github="",
-                    **{f"c{i}": [False, False] for i in range(1, 11)}
-                )
+                new_progress = Progress(user_id=user_id, name=name, github="", solved=0)
                 db.session.add(new_progress)
+                users = self.increment_stat(0, 0)
                 db.session.commit()
+                self.cache_progress(user_id, 0)
+                if users is not None:
+                    self.solve_counts[(0, 0)] = users
                 self.app.logger.info(f"User {name}:{user_id} added to database.")
             return True
         except Exception as e:
@@ -227,16 +478,46 @@ class DataCache:
             db.session.rollback()
             return False
 
+    def load_stats(self) -> None:
+        """Load the user and solve counters from the database into memory."""
+        with self.app.app_context():
+            stats = SolveStat.query.with_entities(SolveStat.week, SolveStat.part, SolveStat.count).all()
+            self.solve_counts = {(week, part): count for week, part, count in stats}
+
+    def increment_stat(self, week: int, part: int) -> int | None:
+        """Add one to a counter within the current transaction. Returns the new count, or None if it has no row.
+
+        No cache version is bumped, as a shared version row would serialize every solve on its
+        lock. Other workers pick the new count up on their next sync.
+        """
+        return db.session.execute(
+            update(SolveStat)
+            .where(SolveStat.week == week, SolveStat.part == part)
+            .values(count=SolveStat.count + 1)
+            .returning(SolveStat.count)
+        ).scalar()
+
+    def get_stats(self) -> dict[str, int | dict[int, list[int]]]:
+        """Registered users and, for each week, how many of them solved part 1 and part 2."""
+        return {
+            "users": self.solve_counts.get((0, 0), 0),
+            "weeks": {week: [self.solve_counts.get((week, part), 0) for part in (1, 2)] for week in range(1, WEEKS + 1)},
+        }
+
+    def load_champions(self) -> None:
+        """Load all users that completed 10 challenges into memory, ordered by finish time."""
+        with self.app.app_context():
+            champions = (
+                Progress.query.with_entities(Progress.name, Progress.github)
+                .filter(Progress.completed_at.isnot(None))
+                .order_by(Progress.completed_at, Progress.id)
+                .all()
+            )
+            self.champions = [{"name": name, "github": github} for name, github in champions]
+
     def get_all_champions(self) -> list[dict[str, str]]:
-        """Get progress for all users that completed 10 challenges."""
-        try:
-            with self.app.app_context():
-                conditions = [getattr(Progress, f"c{i}") == [True, True] for i in range(1, 11)]
-                champions = Progress.query.filter(*conditions).all()
-                return [{"name": champ.name, "github": champ.github} for champ in champions]
-        except Exception as e:
-            self.app.logger.exception(f"Error fetching champions: {e}")
-            return []
+        """Get all users that completed 10 challenges, in order of completion."""
+        return self.champions
 
     def update_champions(self, champions: list[dict[str, str]]) -> bool:
         """Update champions in database"""
@@ -252,10 +533,13 @@ class DataCache:
                     if matching_progress.github != champion["github"]:
                         matching_progress.github = champion["github"]
                         modified = True
+                if modified:
+                    self.bump_version("champions")
 
                 db.session.commit()
 
                 if modified:
+                    self.load_champions()
                     flash("Github Accounts updated successfully", "success")
                 else:
                     flash("No changes made", "success")
@@ -281,10 +565,14 @@ class DataCache:
                     for part in ["part1", "part2"]:
                         if getattr(solution, part) != parts[part]:
                             setattr(solution, part, parts[part])
-                            self.solutions[i][part] = parts[part]
+                            self.solution_hashes[i][part] = self.hash_answer(parts[part])
                             modified = True
+                if modified:
+                    self.bump_version("solutions")
 
                 db.session.commit()
+                if modified:
+                    self.load_html()
 
                 if modified:
                     flash("Github Accounts updated successfully", "success")
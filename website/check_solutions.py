@@ -0,0 +1,100 @@
+import ast
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+from generate_inputs import ANSWERS_FILE
+from solvers import SOLVERS, VECTORIZED_SOLVERS, input_path, normalize_answer, read_input
+
+SETUP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "setup.py")
+
+
+def main():
+    """Check the stored answers by running every reference solver against its puzzle input.
+
+    Each solver's answer, and that of its NumPy version if there is one and NumPy is installed,
+    is normalized the way guesses are and compared with the Solution seed data in setup.py.
+    With --inputs, the inputs and answers written by generate_inputs.py to that folder are
+    checked instead. Reading the input is not timed; solving is, and its peak memory is traced.
+    Exits with status 1 if any answer differs.
+
+    Usage: python check_solutions.py [--inputs <folder>] [week ...]
+    """
+    args = sys.argv[1:]
+    folder = None
+    if "--inputs" in args:
+        i = args.index("--inputs")
+        folder = args[i + 1]
+        del args[i:i + 2]
+    weeks = {int(week) for week in args}
+    stored = generated_answers(folder) if folder else stored_solutions()
+    failures = 0
+    print(f"{'week':>4} {'part':>4} {'solver':>9}  {'seconds':>8} {'peak KiB':>9}  result")
+    for week, part in sorted(stored):
+        if weeks and week not in weeks:
+            continue
+        solvers = [("reference", SOLVERS[(week, part)].function)]
+        if (week, part) in VECTORIZED_SOLVERS:
+            solvers.append(("numpy", VECTORIZED_SOLVERS[(week, part)]))
+        if folder:
+            path = os.path.join(folder, f"{week:02d}", SOLVERS[(week, part)].filename)
+        else:
+            path = input_path(week, part)
+        expected = stored[(week, part)]
+        for name, function in solvers:
+            answer, seconds, peak = run(function, path)
+            if normalize_answer(answer) == normalize_answer(expected):
+                result = "ok"
+            else:
+                result = f"MISMATCH: solved {answer!r}, stored {expected!r}"
+                failures += 1
+            print(f"{week:>4} {part:>4} {name:>9}  {seconds:>8.3f} {peak / 1024:>9,.0f}  {result}")
+
+    if failures:
+        print(f"{failures} answer(s) differ from the stored solutions.")
+        sys.exit(1)
+
+
+def stored_solutions() -> dict[tuple[int, int], str]:
+    """(week, part) -> answer, from the Solution rows setup.py inserts in week order.
+
+    Read from the source, so checking needs neither the database nor the app's dependencies.
+    """
+    with open(SETUP_FILE, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    solutions = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "Solution":
+            keywords = {keyword.arg: ast.literal_eval(keyword.value) for keyword in node.keywords}
+            solutions.append((keywords["part1"], keywords["part2"]))
+    return {
+        (week, part): answer
+        for week, answers in enumerate(solutions, start=1)
+        for part, answer in enumerate(answers, start=1)
+    }
+
+
+def generated_answers(folder: str) -> dict[tuple[int, int], str]:
+    """(week, part) -> answer, from the answers.json generate_inputs.py wrote to `folder`."""
+    with open(os.path.join(folder, ANSWERS_FILE)) as f:
+        answers = json.load(f)
+    return {(int(week), int(part)): answer for week, parts in answers.items() for part, answer in parts.items()}
+
+
+def run(function: Callable, path: str) -> tuple[str, float, int]:
+    """Solve one input. Returns the answer, seconds taken and peak bytes allocated while solving."""
+    puzzle_input = read_input(path)
+    tracemalloc.start()
+    start = time.perf_counter()
+    answer = function(puzzle_input)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return answer, seconds, peak
+
+
+if __name__ == "__main__":
+    main()
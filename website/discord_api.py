@@ -0,0 +1,169 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Base URL of the Discord REST API (overridable to point at a local stub server)
+DISCORD_API_URL = os.getenv("DISCORD_API_URL", "https://discord.com/api")
+# Seconds to wait for the TCP/TLS handshake and for each read from Discord
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT = 10
+# Keep-alive connections held open to Discord and threads used for concurrent calls
+POOL_SIZE = 10
+# Retries of a rate-limited call, and the longest a request will wait on a limit
+MAX_RETRIES = 3
+MAX_RATE_LIMIT_WAIT = 10.0
+
+# IDs that follow these path segments are "major parameters" with their own buckets
+MAJOR_PARAMETER = re.compile(r"(?<!guilds/)(?<!channels/)(?<!webhooks/)\b\d{15,21}\b")
+
+
+class RateLimiter:
+    """Track Discord's rate limit buckets and hold calls until their bucket has room.
+
+    Discord reports the bucket of each route in `X-RateLimit-Bucket`, along with the calls
+    left in it (`X-RateLimit-Remaining`) and when it refills (`X-RateLimit-Reset-After`).
+    Calls in the same bucket are queued behind a per-bucket lock, and a global 429 pauses
+    every call until the global limit resets.
+    """
+
+    def __init__(self, max_wait: float = MAX_RATE_LIMIT_WAIT):
+        self.max_wait = max_wait
+        self.lock = threading.Lock()
+        self.routes = {}  # route key -> bucket hash
+        self.buckets = {}  # bucket hash -> (remaining, monotonic reset time)
+        self.bucket_locks = {}
+        self.global_reset = 0.0
+
+    @staticmethod
+    def route_key(method: str, path: str) -> str:
+        """Reduce a path to its route template, keeping only the major parameters."""
+        return f"{method} {MAJOR_PARAMETER.sub(':id', path)}"
+
+    def bucket_lock(self, route: str) -> threading.Lock:
+        """Get the lock that serializes calls sharing this route's bucket."""
+        with self.lock:
+            bucket = self.routes.get(route, route)
+            return self.bucket_locks.setdefault(bucket, threading.Lock())
+
+    def delay(self, route: str) -> float:
+        """Seconds to wait before a call on this route may be sent."""
+        now = time.monotonic()
+        with self.lock:
+            wait = max(0.0, self.global_reset - now)
+            bucket = self.routes.get(route)
+            if bucket in self.buckets:
+                remaining, reset = self.buckets[bucket]
+                if remaining <= 0:
+                    wait = max(wait, reset - now)
+        return wait
+
+    def acquire(self, route: str) -> float:
+        """Wait for room in the route's bucket and reserve a call from it.
+
+        Returns 0 once a call is reserved, or the required delay without waiting
+        if it is longer than `max_wait`.
+        """
+        with self.bucket_lock(route):
+            if (wait := self.delay(route)) > self.max_wait:
+                return wait
+            time.sleep(wait)
+            with self.lock:
+                bucket = self.routes.get(route)
+                if bucket in self.buckets:
+                    remaining, reset = self.buckets[bucket]
+                    if reset > time.monotonic():
+                        self.buckets[bucket] = (remaining - 1, reset)
+        return 0.0
+
+    def update(self, route: str, response: requests.Response) -> float:
+        """Record the rate limit headers of a response. Returns the retry delay if it was a 429."""
+        headers = response.headers
+        now = time.monotonic()
+        with self.lock:
+            if bucket := headers.get("X-RateLimit-Bucket"):
+                self.routes[route] = bucket
+                try:
+                    remaining = int(headers.get("X-RateLimit-Remaining", 1))
+                    reset_after = float(headers.get("X-RateLimit-Reset-After", 0))
+                except ValueError:
+                    remaining, reset_after = 1, 0.0
+                self.buckets[bucket] = (remaining, now + reset_after)
+
+            if response.status_code != 429:
+                return 0.0
+
+            try:
+                retry_after = float(response.json().get("retry_after", 0))
+            except ValueError:
+                retry_after = 0.0
+            retry_after = max(retry_after, float(headers.get("Retry-After", 0) or 0))
+            if headers.get("X-RateLimit-Global") == "true" or headers.get("X-RateLimit-Scope") == "global":
+                self.global_reset = max(self.global_reset, now + retry_after)
+            else:
+                # Without a bucket header, hold the route's known bucket, or the route itself
+                bucket = self.routes.setdefault(route, bucket or route)
+                self.buckets[bucket] = (0, now + retry_after)
+            return retry_after
+
+
+class DiscordClient:
+    def __init__(self, base_url: str = DISCORD_API_URL, pool_size: int = POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="discord")
+        self.limiter = RateLimiter()
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        """Send a request to the Discord API over the pooled keep-alive session.
+
+        Calls wait for room in their rate limit bucket, and 429 responses are retried after
+        the delay Discord asks for. If the wait would exceed the limiter's `max_wait`, the
+        429 response is returned to the caller instead.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        route = self.limiter.route_key(method, path)
+        for _ in range(MAX_RETRIES + 1):
+            if wait := self.limiter.acquire(route):
+                # Waiting on the limit would take too long, so fail fast with a 429
+                response = requests.Response()
+                response.status_code = 429
+                response.url = f"{self.base_url}{path}"
+                response._content = b'{"message": "Rate limited", "retry_after": %.3f}' % wait
+                return response
+            response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+            retry_after = self.limiter.update(route, response)
+            if response.status_code != 429 or retry_after > self.limiter.max_wait:
+                break
+        return response
+
+    def submit(self, method: str, path: str, **kwargs) -> Future:
+        """Send a request in the background so independent calls can run concurrently."""
+        return self.executor.submit(self.request, method, path, **kwargs)
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def put(self, path: str, **kwargs) -> requests.Response:
+        return self.request("PUT", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    @staticmethod
+    def bot_headers(bot_token: str) -> dict[str, str]:
+        """Headers for calls made on behalf of the bot."""
+        return {"Authorization": f"Bot {bot_token}", "Content-Type": "application/json"}
+
+    @staticmethod
+    def bearer_headers(token: str) -> dict[str, str]:
+        """Headers for calls made on behalf of an OAuth2 user."""
+        return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,56 @@
+import json
+import os
+import sys
+import time
+
+from generators import SCALED_GENERATORS, generate_scaled
+
+ANSWERS_FILE = "answers.json"
+
+
+def main():
+    """Write scaled puzzle inputs and their expected answers, e.g. as stress tests for a future season.
+
+    Each input is streamed to <output>/NN/input<part>.txt, laid out like static/puzzle_input/,
+    and the answers are collected in <output>/answers.json. `scale` multiplies the size of the
+    shared input (1 by default) and `seed` picks the random input (0 by default). Without weeks,
+    every part with a scaled generator is written. Check the results with
+    `python check_solutions.py --inputs <output>`.
+
+    Usage: python generate_inputs.py <output> [scale] [seed] [week ...]
+    """
+    usage = f"Usage: {main.__doc__.split('Usage: ')[1].strip()}"
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help"):
+        sys.exit(usage)
+    output = sys.argv[1]
+    try:
+        scale = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+        weeks = {int(week) for week in sys.argv[4:]}
+    except ValueError:
+        sys.exit(f"Scale, seed and weeks must be whole numbers.\n{usage}")
+    if scale < 1:
+        sys.exit(f"Scale must be at least 1.\n{usage}")
+
+    answers_path = os.path.join(output, ANSWERS_FILE)
+    answers = {}
+    if os.path.exists(answers_path):
+        with open(answers_path) as f:
+            answers = json.load(f)
+
+    for week, part in sorted(SCALED_GENERATORS):
+        if weeks and week not in weeks:
+            continue
+        os.makedirs(os.path.join(output, f"{week:02d}"), exist_ok=True)
+        path = os.path.join(output, f"{week:02d}", f"input{part}.txt")
+        start = time.perf_counter()
+        answer = generate_scaled(week, part, seed, scale, path)
+        answers.setdefault(str(week), {})[str(part)] = answer
+        print(f"Week {week} part {part}: {os.path.getsize(path):,} bytes in {time.perf_counter() - start:.1f}s, answer {answer}")
+
+    with open(answers_path, "w") as f:
+        json.dump(answers, f, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
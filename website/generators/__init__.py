@@ -0,0 +1,56 @@
+"""Per-user puzzle input generators.
+
+Each generator takes a seeded random.Random and returns (input text, expected answer),
+with the answer in the same normalized form as the Solution table (uppercase, spaces
+rather than underscores). Weeks without a registered generator keep the shared input
+from static/puzzle_input/.
+
+Scaled generators build stress inputs for future seasons instead: `scale` times the size of
+the shared input, written line by line to a file rather than built in memory, with the
+expected answer worked out as they go. generate_inputs.py writes them to disk.
+"""
+import random
+from typing import Callable, NamedTuple, TextIO
+
+
+class Generator(NamedTuple):
+    function: Callable[[random.Random], tuple[str, str]]
+    version: int
+
+
+# (week, part) -> Generator
+GENERATORS = {}
+
+
+def register(week: int, part: int, version: int = 1) -> Callable:
+    """Register a generator for one part of a week. Bump `version` whenever its output changes."""
+    def decorator(function: Callable[[random.Random], tuple[str, str]]) -> Callable:
+        GENERATORS[(week, part)] = Generator(function, version)
+        return function
+    return decorator
+
+
+def generate(week: int, part: int, seed: int) -> tuple[str, str]:
+    """Generate the input and expected answer for one part of a week from a seed."""
+    return GENERATORS[(week, part)].function(random.Random(seed))
+
+
+# (week, part) -> function(rng, scale, output) writing a scaled input to `output` and returning its answer
+SCALED_GENERATORS = {}
+
+
+def register_scaled(week: int, part: int) -> Callable:
+    """Register a scaled generator for one part of a week."""
+    def decorator(function: Callable[[random.Random, int, TextIO], str]) -> Callable:
+        SCALED_GENERATORS[(week, part)] = function
+        return function
+    return decorator
+
+
+def generate_scaled(week: int, part: int, seed: int, scale: int, path: str) -> str:
+    """Write a scaled input for one part of a week to `path`. Returns its expected answer."""
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        return SCALED_GENERATORS[(week, part)](random.Random(seed), scale, f)
+
+
+from generators import week01, week02, week04, week06, week07, week08, week09, week10  # noqa: E402,F401
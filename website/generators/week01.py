@@ -0,0 +1,60 @@
+import random
+
+from generators import register
+from generators.words import WORDS, sentence
+
+# Morse code from the Comms Bay booklet, with _ for dahs and . for dits
+MORSE = {
+    "A": "._", "B": "_...", "C": "_._.", "D": "_..", "E": ".", "F": ".._.", "G": "__.",
+    "H": "....", "I": "..", "J": ".___", "K": "_._", "L": "._..", "M": "__", "N": "_.",
+    "O": "___", "P": ".__.", "Q": "__._", "R": "._.", "S": "...", "T": "_", "U": ".._",
+    "V": "..._", "W": ".__", "X": "_.._", "Y": "_.__", "Z": "__..", ".": "._._._",
+    "?": "..__..", "!": "_._.__", "-": "_...._",
+}
+# Every alien transmission starts and ends with three exclamation marks and has one between letters
+ALIEN_MARK = MORSE["!"]
+
+
+@register(1, 1)
+def morse_message(rng: random.Random) -> tuple[str, str]:
+    """Two short sentences in Morse Code, one word per line and one space between letters."""
+    message = " ".join(f"{sentence(rng, rng.randint(3, 5))}{rng.choice('.!?')}" for _ in range(2))
+    lines = [" ".join(MORSE[c] for c in word) for word in message.split()]
+    return "\n".join(lines), message
+
+
+@register(1, 2)
+def alien_word(rng: random.Random) -> tuple[str, str]:
+    """A single word hidden behind Ordinal -> Binary -> Morse -> Text."""
+    while True:
+        word = rng.choice(WORDS)
+        morse = ALIEN_MARK * 3 + ALIEN_MARK.join(MORSE[c] for c in word) + ALIEN_MARK * 3
+        # Splitting on the exclamation mark has to give the word back, or the transmission is ambiguous
+        letters = [code for code in morse.split(ALIEN_MARK) if code]
+        if letters != [MORSE[c] for c in word]:
+            continue
+        digits = str(int(morse.replace(".", "0").replace("_", "1"), 2))
+        if (characters := split_ordinals(rng, digits)) is not None:
+            return characters, word
+
+
+def split_ordinals(rng: random.Random, digits: str) -> str | None:
+    """Cut a decimal string into printable characters whose ordinals concatenate back to it."""
+    characters = []
+    start = 0
+    while start < len(digits):
+        for length in rng.sample((3, 4), 2) + [2, 5]:
+            chunk = digits[start:start + length]
+            end = start + length
+            if (
+                len(chunk) == length
+                and (end == len(digits) or digits[end] != "0")
+                and (character := chr(int(chunk))).isprintable()
+                and not character.isspace()
+            ):
+                characters.append(character)
+                start = end
+                break
+        else:
+            return None
+    return "".join(characters)
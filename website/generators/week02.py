@@ -0,0 +1,52 @@
+import random
+import string
+
+from generators import register
+from generators.words import message_of_length, sentence
+
+# Endings for the made-up section titles; only their first character matters
+TITLE_ENDINGS = (
+    "acinia", "aecenas", "aliquam", "amet", "ante", "arcu", "bibendum", "consequat", "cursus", "dapibus",
+    "donec", "egestas", "elit", "enim", "erat", "etiam", "felis", "fusce", "gravida", "iaculis",
+    "lectus", "ligula", "lorem", "magna", "mattis", "mauris", "metus", "nisi", "nulla", "odio",
+    "orci", "pede", "porta", "purus", "quam", "risus", "sapien", "semper", "tellus", "tempor",
+)
+# Braille dots 1-6 (left column top to bottom, then right column) for each letter
+BRAILLE = {
+    "A": "1", "B": "12", "C": "14", "D": "145", "E": "15", "F": "124", "G": "1245", "H": "125",
+    "I": "24", "J": "245", "K": "13", "L": "123", "M": "134", "N": "1345", "O": "135", "P": "1234",
+    "Q": "12345", "R": "1235", "S": "234", "T": "2345", "U": "136", "V": "1236", "W": "2456",
+    "X": "1346", "Y": "13456", "Z": "1356", " ": "",
+}
+# The BrailLED strip is two rows of 26 braille cells, each cell two light columns wide
+BRAILLED_CELLS = 26
+
+
+@register(2, 1)
+def sorted_pages(rng: random.Random) -> tuple[str, str]:
+    """Shuffled page headers whose titles, once sorted, start with the letters of a message."""
+    message = f"{sentence(rng, rng.randint(7, 11))}{rng.choice('.!')}"
+    # Chapters above 9 catch sorting the numbers as strings
+    headers = sorted(rng.sample([(c, s, n) for c in range(1, 13) for s in string.ascii_uppercase
+                                 for n in range(1, 13)], len(message)))
+    rows = []
+    for character, (chapter, subchapter, section) in zip(message, headers):
+        title = ("_" if character == " " else character) + rng.choice(TITLE_ENDINGS)
+        rows.append(f"{title},{chapter},{subchapter},{section}")
+    rng.shuffle(rows)
+    return "title,chapter,subchapter,section\n" + "\n".join(rows) + "\n", message
+
+
+@register(2, 2)
+def brailled_transmission(rng: random.Random) -> tuple[str, str]:
+    """Shuffled (column bits, column header) tuples that light up a two-row braille message."""
+    message = message_of_length(rng, BRAILLED_CELLS * 2)
+    headers = string.ascii_uppercase + string.ascii_lowercase
+    columns = []
+    for i in range(BRAILLED_CELLS):
+        top, bottom = BRAILLE[message[i]], BRAILLE[message[BRAILLED_CELLS + i]]
+        for dots in ("123", "456"):
+            columns.append("".join("1" if d in cell else "0" for cell in (top, bottom) for d in dots))
+    rows = [f"{bits},{header}" for bits, header in zip(columns, headers)]
+    rng.shuffle(rows)
+    return "\n".join(rows), message
@@ -0,0 +1,36 @@
+import random
+
+from generators import register
+
+# First and second words of a recipe, grouped by length so the X and Y letters line up
+RECIPE_WORDS = {
+    3: (("FIG", "HOT", "RED", "RAW", "DRY"), ("JAM", "POT", "PIE", "BUN", "DIP")),
+    4: (("RICE", "TACO", "CORN", "BEAN", "MINT"), ("CAKE", "SOUP", "STEW", "ROLL", "TART")),
+    5: (("GREEN", "LEMON", "PEACH", "SPICY", "SWEET"), ("SALAD", "BREAD", "CURRY", "TOAST", "JELLY")),
+}
+# How far from the Center of Flavor the individual blooms may lie
+SPREAD = 40
+
+
+@register(4, 1)
+def algae_blooms(rng: random.Random) -> tuple[str, str]:
+    """One line of three m(x,y) blooms per species, whose centers of mass spell a recipe."""
+    firsts, seconds = RECIPE_WORDS[rng.choice(sorted(RECIPE_WORDS))]
+    recipe_x, recipe_y = rng.choice(firsts), rng.choice(seconds)
+    lines = []
+    for cx, cy in zip(map(ord, recipe_x), map(ord, recipe_y)):
+        masses = [rng.randint(1, 30) for _ in range(3)]
+        xs, ys = centered(rng, masses, cx), centered(rng, masses, cy)
+        lines.append(" ".join(f"{m}({x},{y})" for m, x, y in zip(masses, xs, ys)))
+    return "\n".join(lines), f"{recipe_x} {recipe_y}"
+
+
+def centered(rng: random.Random, masses: list[int], center: int) -> list[int]:
+    """Three coordinates whose mass-weighted mean is exactly `center`."""
+    total = sum(masses)
+    while True:
+        first = rng.randint(max(0, center - SPREAD), center + SPREAD)
+        second = rng.randint(max(0, center - SPREAD), center + SPREAD)
+        rest = center * total - masses[0] * first - masses[1] * second
+        if rest % masses[2] == 0 and 0 <= rest // masses[2] <= 255:
+            return [first, second, rest // masses[2]]
@@ -0,0 +1,67 @@
+import math
+import random
+from typing import TextIO
+
+from generators import register_scaled
+
+# Known samples per scale, as many as in the shared input
+SAMPLES = 4860
+# Samples, nearest to the unknown one, that vote on its type
+NEIGHBOURS = 7
+# Planted neighbours of the answer's type; the rest of the NEIGHBOURS are of other types
+MAJORITY = 5
+# Heat shield materials, with typical values of their five measurements
+MATERIALS = {
+    "Boron Nitride Nanotube Composite": (18.0, 15.0, 1.1, 6.0, 0.020),
+    "Graphene-Coated Carbon Fiber Sheet": (16.0, 19.0, 0.8, 7.5, 0.012),
+    "Graphene Nanoplatelet Thermal Interface Material": (14.0, 17.0, 1.4, 5.0, 0.030),
+    "Reinforced Carbon-Carbon (RCC) Shield Tile": (20.0, 14.0, 1.6, 6.5, 0.045),
+    "Diamond-Like Carbon (DLC) Coated Radiator": (19.0, 21.0, 0.7, 8.5, 0.015),
+    "Phenolic Impregnated Carbon Ablator (PICA)": (12.0, 12.0, 1.9, 4.0, 0.055),
+    "Nanocrystalline Diamond Thermal Spreader": (19.5, 15.0, 1.3, 5.5, 0.035),
+    "Silicon Oxycarbide Shield Tile": (13.0, 20.0, 1.0, 9.0, 0.025),
+    "Zirconium Dioxide Ceramic Heat Sink": (16.5, 20.0, 0.7, 8.0, 0.011),
+    "Aerogel-Infused Carbon Fiber Panel": (15.0, 13.0, 0.5, 3.5, 0.008),
+}
+# Relative spread of each measurement around its typical value
+SPREAD = 0.15
+# Planted neighbours lie within NEAR of the unknown sample, and every other sample at least FAR from it
+NEAR = 0.2
+FAR = 0.5
+
+
+@register_scaled(6, 2)
+def heat_sinks(rng: random.Random, scale: int, output: TextIO) -> str:
+    """The unknown sample, then known samples in random order, NEIGHBOURS of them planted nearest to it.
+
+    MAJORITY of the planted samples share the answer's type, so no tie-breaking is involved.
+    """
+    answer = rng.choice(sorted(MATERIALS))
+    target = measurements(rng, answer)
+    others = [kind for kind in sorted(MATERIALS) if kind != answer]
+    planted_kinds = [answer] * MAJORITY + rng.sample(others, NEIGHBOURS - MAJORITY)
+    total = SAMPLES * scale
+    planted = dict(zip(rng.sample(range(total), NEIGHBOURS), planted_kinds))
+
+    output.write(f"{format_sample(target)}\n")
+    for i in range(total):
+        if i in planted:
+            kind = planted[i]
+            offset = [rng.uniform(-1, 1) for _ in target]
+            length = math.hypot(*offset) or 1
+            distance = rng.uniform(0, NEAR)
+            sample = [value + distance * d / length for value, d in zip(target, offset)]
+        else:
+            kind = rng.choice(sorted(MATERIALS))
+            while math.dist(sample := measurements(rng, kind), target) < FAR:
+                pass
+        output.write(f"{format_sample(sample)},{kind}\n")
+    return answer.upper()
+
+
+def measurements(rng: random.Random, kind: str) -> list[float]:
+    return [round(rng.gauss(value, value * SPREAD), 4) for value in MATERIALS[kind]]
+
+
+def format_sample(sample: list[float]) -> str:
+    return ",".join(f"{value:.4g}" for value in sample)
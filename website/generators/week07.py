@@ -0,0 +1,68 @@
+import random
+from typing import TextIO
+
+from generators import register, register_scaled
+
+# Symbols the four-symbol codes are made of. Underscores are left out, since answers treat them as spaces
+SYMBOLS = "!#$%&()*+,-./:;<=>?@[\\]^`{|}~"
+# Quantities of the requested items, as listed in the week's plain text inventory
+REQUESTED = (1081, 1055, 965)  # bandages, healing serum, antacids
+# Other items in the inventory, and how many of each are stocked
+OTHER_ITEMS = 60
+OTHER_QUANTITY = (200, 1200)
+# Codes of discontinued items that still appear a handful of times
+STRAY_CODES = 3000
+# Codes shuffled and written together when streaming a scaled inventory
+BLOCK_CODES = 100_000
+
+
+@register(7, 1)
+def raw_data_file(rng: random.Random) -> tuple[str, str]:
+    """Concatenated four-symbol codes, where the requested items appear exactly REQUESTED times."""
+    codes = set()
+    while len(codes) < len(REQUESTED) + OTHER_ITEMS + STRAY_CODES:
+        codes.add("".join(rng.choices(SYMBOLS, k=4)))
+    codes = sorted(codes)
+    rng.shuffle(codes)
+
+    requested = codes[:len(REQUESTED)]
+    quantities = list(REQUESTED)
+    for _ in range(OTHER_ITEMS):
+        quantity = rng.randint(*OTHER_QUANTITY)
+        quantities.append(quantity if quantity not in REQUESTED else quantity + 1)
+    quantities += [rng.randint(1, 3) for _ in range(STRAY_CODES)]
+
+    stream = [code for code, quantity in zip(codes, quantities) for _ in range(quantity)]
+    rng.shuffle(stream)
+    return "".join(stream), "".join(requested)
+
+
+@register_scaled(7, 1)
+def raw_data_stream(rng: random.Random, scale: int, output: TextIO) -> str:
+    """As raw_data_file with `scale` times as many other items and stray codes, written a block at a time.
+
+    Each code's quantity is spread evenly over the blocks, starting from a random block, and
+    every block is shuffled on its own, so only one block of the stream is held in memory.
+    """
+    codes = set()
+    while len(codes) < len(REQUESTED) + (OTHER_ITEMS + STRAY_CODES) * scale:
+        codes.add("".join(rng.choices(SYMBOLS, k=4)))
+    codes = sorted(codes)
+    rng.shuffle(codes)
+
+    quantities = list(REQUESTED)
+    for _ in range(OTHER_ITEMS * scale):
+        quantity = rng.randint(*OTHER_QUANTITY)
+        quantities.append(quantity if quantity not in REQUESTED else quantity + 1)
+    quantities += [rng.randint(1, 3) for _ in range(STRAY_CODES * scale)]
+
+    blocks = -(-sum(quantities) // BLOCK_CODES)
+    starts = [rng.randrange(blocks) for _ in codes]
+    for block in range(blocks):
+        stream = []
+        for code, quantity, start in zip(codes, quantities, starts):
+            share, extra = divmod(quantity, blocks)
+            stream += [code] * (share + ((block - start) % blocks < extra))
+        rng.shuffle(stream)
+        output.write("".join(stream))
+    return "".join(codes[:len(REQUESTED)])
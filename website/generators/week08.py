@@ -0,0 +1,45 @@
+import random
+from typing import TextIO
+
+from generators import register_scaled
+
+# Width of the shelf stocked in part 1, and of the three shelves in part 2, in cm
+SHELF = 500
+SHELVES = (500, 415, 495)
+# Bags in the shared inventory; a scaled one has `scale` times as many
+BAGS = 100
+# Where the bags come from, and what's in them
+COUNTRIES = (
+    "Angola", "Bhutan", "Chile", "Colombia", "Cook Islands", "Costa Rica", "Ecuador", "Eritrea",
+    "Finland", "Guatemala", "Honduras", "Indonesia", "Japan", "Laos", "Madagascar", "Malaysia",
+    "Mexico", "Papua New Guinea", "Paraguay", "Peru", "Samoa", "Solomon Islands", "Vietnam", "Yemen",
+)
+BEANS = ("Arabica", "Excelsa", "Liberica", "MundoNovo", "Robusta", "Typica")
+ROASTS = (
+    "Blonde Roast", "Breakfast Roast", "Cinnamon Roast", "Dark Roast", "Extra Dark Roast",
+    "French Roast", "Light Roast", "Medium Roast", "Vienna Roast",
+)
+# Bag widths in cm, and the share of bags rated well above or below what their size suggests
+WIDTHS = (10, 180)
+STANDOUTS = 0.2
+
+
+@register_scaled(8, 1)
+def coffee_inventory(rng: random.Random, scale: int, output: TextIO) -> str:
+    """The inventory, one bag per line, solving the 0/1 knapsack for the shelf a bag at a time.
+
+    Most bags are rated about 10 below their width, like the shared inventory. Only the table of
+    best ratings per width is kept, so the answer costs SHELF steps per bag and no memory per bag.
+    """
+    best = [0] * (SHELF + 1)
+    output.write("country,bean,roast,width,rating\n")
+    for _ in range(BAGS * scale):
+        width = rng.randint(*WIDTHS)
+        if rng.random() < STANDOUTS:
+            rating = max(1, width + rng.randint(-20, 55))
+        else:
+            rating = max(1, width - rng.randint(10, 11))
+        for used in range(SHELF, width - 1, -1):
+            best[used] = max(best[used], best[used - width] + rating)
+        output.write(f"{rng.choice(COUNTRIES)},{rng.choice(BEANS)},{rng.choice(ROASTS)},{width},{rating}\n")
+    return str(best[SHELF])
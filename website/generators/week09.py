@@ -0,0 +1,143 @@
+import heapq
+import math
+import random
+from typing import TextIO
+
+from generators import register_scaled
+
+# Cells a side of the map in each part, as in the shared inputs; a scaled map has `scale` times as many cells
+SIDES = {1: 61, 2: 99}
+# Chance that a cell between two corridors is a dead end off the corridor above it
+DEAD_END_CHANCE = 0.4
+# Wormholes in part 2 per scale, how many cells each one connects to, and how far apart along
+# the winding path those cells may be. Each wormhole only shortcuts its own stretch of the path,
+# so the shortest path grows with the map instead of collapsing as wormholes are added.
+WORMHOLES = 80
+WORMHOLE_LINKS = 19
+WORMHOLE_REACH = 150
+# Answers of the shared inputs; a scaled input's answer is never smaller
+SHARED_ANSWERS = {1: 289, 2: 424}
+# Wormhole layouts tried before giving up on reaching the shared answer
+ATTEMPTS = 20
+
+
+@register_scaled(9, 1)
+def nebula_labyrinth(rng: random.Random, scale: int, output: TextIO) -> str:
+    return labyrinth(rng, scale, output, part=1)
+
+
+@register_scaled(9, 2)
+def wormhole_labyrinth(rng: random.Random, scale: int, output: TextIO) -> str:
+    return labyrinth(rng, scale, output, part=2)
+
+
+def labyrinth(rng: random.Random, scale: int, output: TextIO, part: int) -> str:
+    """A grid map of nodes numbered row by row, written a row at a time.
+
+    Even rows are corridors, joined into one winding path by a single cell at alternating
+    ends of the odd rows in between. The other cells of odd rows are walls or dead ends off
+    the corridor above, so the winding path is the only way through until wormholes are added.
+    Wormholes (part 2) are extra nodes after the grid, each connected to corridor cells within
+    WORMHOLE_REACH of each other along the winding path.
+
+    Raises:
+        ValueError: If no wormhole layout leaves a path at least as long as the shared input's.
+    """
+    width = round(SIDES[part] * math.sqrt(scale))
+    height = width | 1  # odd, so the map starts and ends on a corridor
+    corridors = (height + 1) // 2
+    end = (height - 1) * width + (width - 1 if corridors % 2 else 0)
+
+    for _ in range(ATTEMPTS):
+        links = {}  # corridor cell -> wormholes it connects to
+        reaches = wormholes(rng, width, corridors, width * height, WORMHOLES * scale if part == 2 else 0, links)
+        if (answer := shortest_path(links, width, corridors)) >= SHARED_ANSWERS[part]:
+            break
+    else:
+        raise ValueError(f"Week 9 part {part} at scale {scale}: shortest path {answer} is shorter than the shared input's")
+
+    output.write(f"0,{end}\n")
+    above_joint = None  # cell joining the current corridor to the one above
+    for y in range(0, height, 2):
+        below = None
+        if y + 1 < height:
+            joint = width - 1 if (y // 2) % 2 == 0 else 0
+            below = {x for x in range(width) if x == joint or rng.random() < DEAD_END_CHANCE}
+        for x in range(width):
+            node = y * width + x
+            linked = [node - 1] if x else []
+            linked += [node + 1] if x < width - 1 else []
+            if x == above_joint:
+                linked.append(node - width)
+            if below is not None and x in below:
+                linked.append(node + width)
+            output.write(f"{node}:{','.join(map(str, linked + links.get(node, [])))}\n")
+        if below is not None:
+            for x in sorted(below):
+                node = (y + 1) * width + x
+                linked = [node - width, node + width] if x == joint else [node - width]
+                output.write(f"{node}:{','.join(map(str, linked))}\n")
+            above_joint = joint
+
+    for wormhole, cells in reaches.items():
+        output.write(f"{wormhole}:{','.join(map(str, cells))}\n")
+    return str(answer)
+
+
+def wormholes(rng: random.Random, width: int, corridors: int, first: int, count: int,
+              links: dict[int, list[int]]) -> dict[int, list[int]]:
+    """Place `count` wormholes, numbered from `first`, and record the cells each connects in `links`.
+
+    Returns wormhole -> the corridor cells it connects to.
+    """
+    length = corridors * (width + 1) - 1  # positions on the winding path, joints included
+    reaches = {}
+    for wormhole in range(first, first + count):
+        start = rng.randrange(max(1, length - WORMHOLE_REACH))
+        cells = set()
+        while len(cells) < WORMHOLE_LINKS:
+            corridor, offset = divmod(start + rng.randrange(WORMHOLE_REACH), width + 1)
+            if offset < width and corridor < corridors:  # not a joint between corridors
+                cells.add(2 * corridor * width + (offset if corridor % 2 == 0 else width - 1 - offset))
+        reaches[wormhole] = sorted(cells)
+        for cell in reaches[wormhole]:
+            links.setdefault(cell, []).append(wormhole)
+    return reaches
+
+
+def shortest_path(links: dict[int, list[int]], width: int, corridors: int) -> int:
+    """Nodes on the shortest path, both ends included, using the winding path and the wormholes.
+
+    Only the start, the end, the cells wormholes connect to and the wormholes themselves are
+    searched: consecutive cells along the winding path are as far apart as their positions on it.
+    Wormhole ids come after every grid cell, so they never clash with a position.
+    """
+    def position(cell: int) -> int:
+        y, x = divmod(cell, width)
+        corridor = y // 2
+        return corridor * (width + 1) + (x if corridor % 2 == 0 else width - 1 - x)
+
+    length = corridors * (width + 1) - 2  # position of the end
+    stops = sorted({0, length, *map(position, links)})
+    graph = {stop: [] for stop in stops}
+    for before, after in zip(stops, stops[1:]):
+        graph[before].append((after, after - before))
+        graph[after].append((before, after - before))
+    for cell, wormholes in links.items():
+        for wormhole in wormholes:
+            graph.setdefault(wormhole, []).append((position(cell), 1))
+            graph[position(cell)].append((wormhole, 1))
+
+    distances = {0: 0}
+    queue = [(0, 0)]
+    while queue:
+        distance, stop = heapq.heappop(queue)
+        if stop == length:
+            return distance + 1
+        if distance > distances[stop]:
+            continue
+        for other, step in graph[stop]:
+            if distance + step < distances.get(other, math.inf):
+                distances[other] = distance + step
+                heapq.heappush(queue, (distance + step, other))
+    raise ValueError("The end cannot be reached")
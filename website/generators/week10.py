@@ -0,0 +1,69 @@
+import math
+import random
+from typing import TextIO
+
+from generators import register_scaled
+
+# Where the energy enters the Battle Dome, and the nodes it must reach, from the week's instructions
+DOME_SOURCE = "0"
+DOME_TARGETS = ("76", "77", "78", "79", "80")
+# Nodes per layer and layers on each side of the weak seam, about the size of the shared dome
+LAYER_NODES = 8
+LAYERS = 4
+# Extra edges per node to the next layer and along its own layer, besides the one each node is given
+EXTRA_EDGES = 1
+SIDE_EDGES = 0.5
+# Capacities of the edges across the seam, and the chance a strong edge has no limit at all
+SEAM_CAPACITY = (500, 20000)
+UNLIMITED_CHANCE = 0.1
+
+
+@register_scaled(10, 2)
+def battle_dome(rng: random.Random, scale: int, output: TextIO) -> str:
+    """Layers of nodes from the source to the targets, split in two by a seam of weak edges.
+
+    The seam's edges are the only ones from the source's half to the targets' half, and every
+    other edge can carry at least their combined capacity. Every node is reachable from the
+    source and reaches a target, so the seam is a minimum cut and the maximum flow is its total.
+    """
+    width = round(LAYER_NODES * math.sqrt(scale))
+    layers = round(LAYERS * math.sqrt(scale))
+    seam = [(rng.randrange(width), rng.randrange(width), rng.randint(*SEAM_CAPACITY)) for _ in range(2 * width)]
+    total = sum(capacity for _, _, capacity in seam)
+    reserved = {int(DOME_SOURCE), *map(int, DOME_TARGETS)}
+
+    def node(layer: int, index: int) -> str:
+        """Name of a node, numbered layer by layer and skipping the source and targets."""
+        number = layer * width + index
+        for taken in sorted(reserved):
+            if number >= taken:
+                number += 1
+        return str(number)
+
+    def strong() -> str:
+        return "Inf" if rng.random() < UNLIMITED_CHANCE else str(rng.randint(total, 2 * total))
+
+    for index in range(width):
+        output.write(f"{DOME_SOURCE}-{node(0, index)} Inf\n")
+    for layer in range(2 * layers):
+        if layer == layers - 1:
+            for before, after, capacity in seam:
+                output.write(f"{node(layer, before)}-{node(layer + 1, after)} {capacity}\n")
+        elif layer < 2 * layers - 1:
+            for start, end in layer_edges(rng, width):
+                output.write(f"{node(layer, start)}-{node(layer + 1, end)} {strong()}\n")
+        for _ in range(round(width * SIDE_EDGES)):
+            start, end = rng.sample(range(width), 2)
+            output.write(f"{node(layer, start)}-{node(layer, end)} {strong()}\n")
+    for start, end in layer_edges(rng, width, len(DOME_TARGETS)):
+        output.write(f"{node(2 * layers - 1, start)}-{DOME_TARGETS[end]} {strong()}\n")
+    return str(total)
+
+
+def layer_edges(rng: random.Random, width: int, next_width: int | None = None) -> list[tuple[int, int]]:
+    """Edges from one layer to the next that leave every node with a way out and the next layer's with a way in."""
+    next_width = next_width or width
+    edges = [(start, rng.randrange(next_width)) for start in range(width)]
+    edges += [(rng.randrange(width), end) for end in range(next_width)]
+    edges += [(rng.randrange(width), rng.randrange(next_width)) for _ in range(width * EXTRA_EDGES)]
+    return edges
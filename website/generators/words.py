@@ -0,0 +1,38 @@
+import random
+
+# Vocabulary for generated messages, in keeping with the story aboard the STS Solara
+WORDS = (
+    "ALIEN", "ALGAE", "ARMY", "ASTRO", "BEACON", "BLAST", "BRIDGE", "CADET", "CAPTAIN", "CARGO",
+    "COMET", "COSMOS", "CREW", "DAWN", "DECK", "DOME", "DRIFT", "EOS", "FLEET", "FUEL",
+    "GALAXY", "GALLEY", "GODDESS", "HATCH", "HULL", "JOURNEY", "LASER", "LIGHT", "LUNAR", "MAP",
+    "METEOR", "MISSION", "MOON", "NEBULA", "NODE", "ORBIT", "PATROL", "PLANET", "PROBE", "PULSAR",
+    "QUASAR", "RADAR", "RETURN", "RISE", "ROCKET", "SHIP", "SIGNAL", "SOLAR", "SPACE", "STAR",
+    "STORM", "SUN", "THRUST", "VORTEX", "VOYAGE", "WARP", "WORMHOLE", "XARLOS", "ZENITH", "ZONE",
+)
+# Short words that join the vocabulary into readable phrases
+LINKS = ("A", "AT", "BY", "FOR", "IN", "IS", "OF", "ON", "THE", "TO", "UP", "WE", "OUR", "AND", "NOW")
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """A phrase alternating vocabulary and linking words, e.g. 'CADET TO THE BRIDGE'."""
+    picked = []
+    for i in range(words):
+        picked.append(rng.choice(WORDS if i % 2 == 0 or i == words - 1 else LINKS))
+    return " ".join(picked)
+
+
+def message_of_length(rng: random.Random, length: int) -> str:
+    """A phrase of exactly `length` characters, built from whole vocabulary and linking words."""
+    vocabulary = WORDS + LINKS
+    while True:
+        words = []
+        remaining = length
+        while remaining > 0:
+            fitting = [w for w in vocabulary if len(w) == remaining or len(w) < remaining - 1]
+            if not fitting:
+                break
+            word = rng.choice(fitting)
+            words.append(word)
+            remaining -= len(word) + 1
+        if remaining == -1:
+            return " ".join(words)
@@ -0,0 +1,232 @@
+import hashlib
+import hmac
+import json
+import mimetypes
+import mmap
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import Request, Response, send_file
+
+from generators import GENERATORS, generate
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "puzzle_input")
+# Bytes per chunk when streaming an input to the client
+CHUNK_SIZE = 64 * 1024
+# Inputs up to this size are kept mapped in memory to answer Range requests from
+MAX_MAPPED_SIZE = 4 * 1024 * 1024
+# On-disk store of generated per-user inputs, shared by every worker
+GENERATED_DIR = os.getenv("GENERATED_INPUT_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated"))
+# Secret mixed into every seed, so inputs cannot be regenerated from a user id alone
+SEED_SALT = os.getenv("INPUT_SEED_SALT")
+# Total size of generated inputs held in memory per worker
+GENERATED_CACHE_BYTES = 32 * 1024 * 1024
+# Input files that a generator can replace, e.g. input2.txt -> part 2
+GENERATED_INPUT = re.compile(r"input([12])\.txt")
+
+
+class InputIndex:
+    def __init__(self, folder: str = INPUT_DIR):
+        self.folder = folder
+        self.files = {}  # (week, filename) -> file details and, for small files, the mapped contents for Range requests
+        self.load()
+
+    def load(self) -> None:
+        """Index every puzzle input once, so requests never stat, hash or read them from disk."""
+        files = {}
+        for week_dir in sorted(os.listdir(self.folder)):
+            if not week_dir.isdigit():
+                continue
+            for name in sorted(os.listdir(os.path.join(self.folder, week_dir))):
+                path = os.path.join(self.folder, week_dir, name)
+                if os.path.isfile(path):
+                    files[(int(week_dir), name)] = self.index_file(path)
+        self.files = files
+
+    @staticmethod
+    def index_file(path: str) -> dict:
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = None
+            if stat.st_size <= MAX_MAPPED_SIZE:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+                etag = hashlib.sha256(data).hexdigest()[:20]
+            else:
+                etag = hashlib.file_digest(f, "sha256").hexdigest()[:20]
+        return {
+            "path": path,
+            "size": stat.st_size,
+            "mimetype": mimetypes.guess_type(path)[0] or "application/octet-stream",
+            "last_modified": datetime.fromtimestamp(int(stat.st_mtime), timezone.utc),
+            "etag": etag,
+            "data": data,
+        }
+
+    def response(self, request: Request, week: int, filename: str, max_age: int) -> Response | None:
+        """Build a streamed response for an input, answering conditional and Range requests.
+
+        Args:
+            request (Request): The incoming request, for its conditional and Range headers.
+            week (int): The challenge week.
+            filename (str): Name of the input file inside the week's folder.
+            max_age (int): Seconds browsers may reuse the input before revalidating it.
+        Returns:
+            Response | None: The input (200, 206, 304 or 416), or None if there is no such input.
+        """
+        if (entry := self.files.get((week, filename))) is None:
+            return None
+
+        if entry["data"] is None or request.range is None:
+            # Whole files go out through the WSGI server's file wrapper, which uses sendfile()
+            response = send_file(
+                entry["path"], mimetype=entry["mimetype"], conditional=True, etag=entry["etag"],
+                last_modified=entry["last_modified"], max_age=max_age,
+            )
+            response.cache_control.no_cache = False
+            response.cache_control.public = True
+            return response
+
+        response = stream_response(entry["data"], entry["mimetype"], entry["etag"], max_age)
+        response.last_modified = entry["last_modified"]
+        response.cache_control.public = True
+        return response.make_conditional(request, accept_ranges=True, complete_length=entry["size"])
+
+
+def seed_salt(secret_key: str | None) -> str:
+    """INPUT_SEED_SALT, or a salt derived from the app's secret key when it is not set.
+
+    Raises:
+        RuntimeError: If neither is set, since the generators are public and every input
+            and answer could then be rebuilt from a Discord user id.
+    """
+    if SEED_SALT:
+        return SEED_SALT
+    if not secret_key:
+        raise RuntimeError("Set INPUT_SEED_SALT or SECRET_KEY to generate puzzle inputs")
+    return hmac.new(secret_key.encode(), b"input-seed-salt", hashlib.sha256).hexdigest()
+
+
+class GeneratedInputs:
+    def __init__(self, salt: str, folder: str = GENERATED_DIR, max_bytes: int = GENERATED_CACHE_BYTES):
+        if not salt:
+            raise ValueError("Generated inputs need a secret salt")
+        self.folder = folder
+        self.salt = salt.encode()
+        self.max_bytes = max_bytes
+        self.cache = OrderedDict()  # store key -> {"data", "etag", "answer"}, least recently used first
+        self.cache_bytes = 0
+
+    def seed(self, user_id: str, week: int, part: int) -> int:
+        """Derive a stable seed from the Discord user id, so a user always gets the same input."""
+        digest = hmac.new(self.salt, f"{user_id}:{week}:{part}".encode(), hashlib.sha256).digest()
+        return int.from_bytes(digest[:8], "big")
+
+    def get(self, user_id: str, week: int, part: int) -> dict | None:
+        """Return a user's generated input and answer, generating it only the first time.
+
+        Args:
+            user_id (str): Discord user id.
+            week (int): The challenge week.
+            part (int): The challenge part (1 or 2).
+        Returns:
+            dict | None: {"data", "etag", "answer"}, or None if the part has no generator.
+        """
+        if (generator := GENERATORS.get((week, part))) is None:
+            return None
+        seed = self.seed(user_id, week, part)
+        key = f"{week:02}-{part}-v{generator.version}-{seed:016x}"
+        if (entry := self.cache.get(key)) is not None:
+            self.cache.move_to_end(key)
+            return entry
+
+        if (entry := self.load(key)) is None:
+            text, answer = generate(week, part, seed)
+            entry = self.store(key, text.encode(), answer)
+        self.cache[key] = entry
+        self.cache_bytes += len(entry["data"])
+        while self.cache_bytes > self.max_bytes and len(self.cache) > 1:
+            _, evicted = self.cache.popitem(last=False)
+            self.cache_bytes -= len(evicted["data"])
+        return entry
+
+    def load(self, key: str) -> dict | None:
+        """Read a previously generated input from the on-disk store."""
+        try:
+            with open(os.path.join(self.folder, "refs", f"{key}.json")) as f:
+                ref = json.load(f)
+            with open(self.object_path(ref["object"]), "rb") as f:
+                data = f.read()
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+        return {"data": data, "etag": ref["object"][:20], "answer": ref["answer"]}
+
+    def store(self, key: str, data: bytes, answer: str) -> dict:
+        """Write an input under its content hash, and point the user's key at it.
+
+        Files are written to a temporary name and renamed, so concurrent workers never read a partial file.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        try:
+            if not os.path.exists(path := self.object_path(digest)):
+                write_atomic(path, data)
+            write_atomic(
+                os.path.join(self.folder, "refs", f"{key}.json"),
+                json.dumps({"object": digest, "answer": answer}).encode(),
+            )
+        except OSError:
+            # The store only saves regeneration; the input can still be served from memory
+            pass
+        return {"data": data, "etag": digest[:20], "answer": answer}
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.folder, "objects", digest[:2], digest)
+
+    def answer(self, user_id: str, week: int, part: int) -> str | None:
+        """The expected answer for a user's generated input, or None if the part has no generator."""
+        entry = self.get(user_id, week, part)
+        return entry and entry["answer"]
+
+    def response(self, request: Request, user_id: str, week: int, filename: str, max_age: int) -> Response | None:
+        """Build a streamed response for a user's generated input.
+
+        Args:
+            request (Request): The incoming request, for its conditional and Range headers.
+            user_id (str): Discord user id.
+            week (int): The challenge week.
+            filename (str): Name of the input file, e.g. input1.txt.
+            max_age (int): Seconds the browser may reuse the input before revalidating it.
+        Returns:
+            Response | None: The input, or None if the file has no generator.
+        """
+        if not (match := GENERATED_INPUT.fullmatch(filename)):
+            return None
+        if (entry := self.get(user_id, week, int(match[1]))) is None:
+            return None
+        response = stream_response(entry["data"], "text/plain", entry["etag"], max_age)
+        response.cache_control.private = True
+        response.vary.add("Cookie")
+        return response.make_conditional(request, accept_ranges=True, complete_length=len(entry["data"]))
+
+
+def stream_response(data: mmap.mmap | bytes, mimetype: str, etag: str, max_age: int) -> Response:
+    """A response that streams in-memory data in CHUNK_SIZE pieces; the caller makes it conditional."""
+    response = Response(
+        (data[start:start + CHUNK_SIZE] for start in range(0, len(data), CHUNK_SIZE)),
+        mimetype=mimetype,
+        direct_passthrough=True,
+    )
+    response.content_length = len(data)
+    response.accept_ranges = "bytes"
+    response.set_etag(etag)
+    response.cache_control.max_age = max_age
+    return response
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+    os.replace(temporary, path)
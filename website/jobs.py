@@ -0,0 +1,147 @@
+from datetime import timedelta
+
+import requests
+from flask import Flask
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+
+from discord_api import DiscordClient
+from models import db, DiscordJob
+
+VERIFIED_ROLE = "1173170054695764050"
+# A claimed job becomes visible to other workers again if not finished within this lease
+LEASE = timedelta(minutes=2)
+# Retry delays grow from BACKOFF_BASE, doubling per attempt, up to BACKOFF_MAX
+BACKOFF_BASE = timedelta(seconds=5)
+BACKOFF_MAX = timedelta(minutes=30)
+MAX_ATTEMPTS = 8
+
+
+class DiscordJobError(Exception):
+    """A Discord side effect failed and the job should be retried."""
+
+
+class JobQueue:
+    def __init__(self, app: Flask):
+        self.app = app
+
+    def enqueue(self, user_id: str, week: int, token: str) -> bool:
+        """Queue the Discord side effects of a completed week. Only one job is kept per (user, week).
+
+        A job that already failed permanently is reset so the user can try again.
+        """
+        statement = insert(DiscordJob).values(user_id=user_id, week=week, token=token, status="pending")
+        statement = statement.on_conflict_do_update(
+            index_elements=[DiscordJob.user_id, DiscordJob.week],
+            set_={"status": "pending", "attempts": 0, "token": token, "run_at": func.now()},
+            where=DiscordJob.status == "failed",
+        )
+        try:
+            with self.app.app_context():
+                db.session.execute(statement)
+                db.session.commit()
+            return True
+        except Exception as e:
+            self.app.logger.exception(f"Error queueing Discord job for {user_id} week {week}: {e}")
+            db.session.rollback()
+            return False
+
+    def claim(self, limit: int = 10) -> list[dict]:
+        """Lease up to `limit` due jobs. Rows locked by another worker are skipped."""
+        with self.app.app_context():
+            try:
+                jobs = (
+                    DiscordJob.query
+                    .filter(DiscordJob.status == "pending", DiscordJob.run_at <= func.now())
+                    .order_by(DiscordJob.run_at)
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                    .all()
+                )
+                claimed = []
+                for job in jobs:
+                    job.attempts += 1
+                    job.run_at = func.now() + LEASE
+                    claimed.append({"id": job.id, "user_id": job.user_id, "week": job.week,
+                                    "token": job.token, "attempts": job.attempts})
+                db.session.commit()
+                return claimed
+            except Exception as e:
+                self.app.logger.exception(f"Error claiming Discord jobs: {e}")
+                db.session.rollback()
+                return []
+
+    def complete(self, job_id: int) -> None:
+        """Mark a job as done and drop the OAuth token it no longer needs.
+
+        If the database is unavailable, the job runs again once its lease expires.
+        """
+        with self.app.app_context():
+            try:
+                db.session.execute(
+                    update(DiscordJob).where(DiscordJob.id == job_id).values(status="done", token=None, last_error=None)
+                )
+                db.session.commit()
+            except Exception as e:
+                self.app.logger.exception(f"Error completing Discord job {job_id}: {e}")
+                db.session.rollback()
+
+    def retry(self, job_id: int, attempts: int, error: str) -> None:
+        """Reschedule a failed job with exponential backoff, or give up after MAX_ATTEMPTS.
+
+        If the database is unavailable, the job runs again once its lease expires.
+        """
+        values = {"last_error": error[:1000]}
+        if attempts >= MAX_ATTEMPTS:
+            values |= {"status": "failed", "token": None}
+        else:
+            values["run_at"] = func.now() + min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+        with self.app.app_context():
+            try:
+                db.session.execute(update(DiscordJob).where(DiscordJob.id == job_id).values(**values))
+                db.session.commit()
+            except Exception as e:
+                self.app.logger.exception(f"Error rescheduling Discord job {job_id}: {e}")
+                db.session.rollback()
+
+
+def grant_access(client: DiscordClient, bot_token: str, guild_id: str, channel_id: str,
+                 user_id: str, week: int, token: str | None) -> None:
+    """Add a user to the guild with the verified role and announce their solve in the week's thread.
+
+    Raises:
+        DiscordJobError: If any Discord call fails.
+    """
+    headers = client.bot_headers(bot_token)
+    member_url = f"/v9/guilds/{guild_id}/members/{user_id}"
+    thread_member_url = f"/v9/channels/{channel_id}/thread-members/{user_id}"
+
+    # The guild-member and thread-member checks are independent, so run them concurrently
+    member_check = client.submit("GET", member_url, headers=headers)
+    thread_check = client.submit("GET", thread_member_url, headers=headers)
+    try:
+        response = member_check.result()
+        thread_response = thread_check.result()
+    except requests.exceptions.RequestException as e:
+        raise DiscordJobError(f"Error: {e}") from e
+
+    if response.status_code == 404:  # User is not a member of the guild
+        try:
+            response = client.put(member_url, headers=headers, json={"access_token": token})
+            response.raise_for_status()
+            response = client.put(f"{member_url}/roles/{VERIFIED_ROLE}", headers=headers)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise DiscordJobError(f"Error: Failed to assign role: {e}") from e
+        if response.status_code != 204:
+            raise DiscordJobError(f"Error: Failed to assign role: {response.text}")
+    elif response.status_code != 200:
+        raise DiscordJobError(f"Error: Failed to check guild member: {response.text}")
+
+    if thread_response.status_code != 200:
+        content = f"<@{user_id}> solved week {week}! If you'd like, please share how you arrived at the correct answer!"
+        try:
+            response = client.post(f"/v9/channels/{channel_id}/messages", headers=headers, json={"content": content})
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            raise DiscordJobError(f"Error: Failed to send message: {e}") from e
@@ -1,9 +1,28 @@
+from datetime import datetime
+
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 db = SQLAlchemy()
 
+# Sections of the DataCache that admins can edit at runtime, each with a shared version row
+CACHE_SECTIONS = ("release", "constants", "solutions", "html", "champions")
+
+WEEKS = 10
+# Solved mask of a user who completed both parts of every week
+ALL_SOLVED = (1 << (2 * WEEKS)) - 1
+
+
+def progress_bit(week: int, part: int) -> int:
+    """Bit of the solved mask for a part (0 or 1) of a challenge week (1 through 10)."""
+    return 1 << (2 * (week - 1) + part)
+
+
+def unpack_progress(solved: int) -> list[list[bool]]:
+    """Expand a solved mask into [part 1, part 2] pairs for each week."""
+    return [[bool(solved & progress_bit(week, part)) for part in (0, 1)] for week in range(1, WEEKS + 1)]
+
 
 class DiscordID(db.Model):
     __tablename__ = 'discord_ids'
@@ -50,18 +69,12 @@ class Progress(db.Model):
 
     id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
     user_id: Mapped[str] = mapped_column(db.String(20), nullable=False, unique=True)
-    c1: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c2: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c3: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c4: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c5: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c6: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c7: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c8: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c9: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
-    c10: Mapped[list[bool]] = mapped_column(db.ARRAY(db.Boolean))
+    # Bit 2 * (week - 1) + part is set once that part of that week is solved. Not indexed: rows are
+    # found by user_id, and a btree on the mask could not serve the bit tests anyway
+    solved: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0, server_default="0")
     name: Mapped[str] = mapped_column(db.String(255))
     github: Mapped[str] = mapped_column(db.String(255))
+    completed_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=True, index=True)
 
 
 class Solution(db.Model):
@@ -84,3 +97,82 @@ class Release(db.Model):
 
     id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
     release: Mapped[int] = mapped_column(db.Integer)
+
+
+class CacheVersion(db.Model):
+    __tablename__ = 'cache_versions'
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    section: Mapped[str] = mapped_column(db.String(20), nullable=False, unique=True)
+    version: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+
+
+class DiscordJob(db.Model):
+    __tablename__ = 'discord_jobs'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'week'),
+        db.Index('ix_discord_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    user_id: Mapped[str] = mapped_column(db.String(20), nullable=False)
+    week: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    token: Mapped[str] = mapped_column(db.Text, nullable=True)
+    status: Mapped[str] = mapped_column(db.String(10), nullable=False, default='pending')
+    attempts: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+    last_error: Mapped[str] = mapped_column(db.Text, nullable=True)
+    run_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), server_default=func.now())
+
+
+class SubmissionLimit(db.Model):
+    __tablename__ = 'submission_limits'
+    __table_args__ = (
+        db.UniqueConstraint('client', 'week'),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    # "user:<discord id>" for logged-in users, otherwise "ip:<address>"
+    client: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    week: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    tokens: Mapped[float] = mapped_column(db.Float, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class Submission(db.Model):
+    __tablename__ = 'submissions'
+    __table_args__ = (
+        db.Index('ix_submissions_week_part_client', 'week', 'part', 'client'),
+    )
+
+    id: Mapped[int] = mapped_column(db.BigInteger, primary_key=True)
+    # Same client key as submission_limits: "user:<discord id>" or "ip:<address>"
+    client: Mapped[str] = mapped_column(db.String(64), nullable=False)
+    week: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    part: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    correct: Mapped[bool] = mapped_column(db.Boolean, nullable=False)
+    # Normalized wrong guess; correct guesses are not stored so the table never holds answers
+    guess: Mapped[str] = mapped_column(db.String(100), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False)
+
+
+class SolveStat(db.Model):
+    __tablename__ = 'solve_stats'
+    __table_args__ = (
+        db.UniqueConstraint('week', 'part'),
+    )
+
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True)
+    # Week 0, part 0 counts registered users; every other row counts the users who solved that part
+    week: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    part: Mapped[int] = mapped_column(db.Integer, nullable=False)
+    count: Mapped[int] = mapped_column(db.Integer, nullable=False, default=0)
+
+
+class ServerSession(db.Model):
+    __tablename__ = 'sessions'
+
+    # Opaque random id sent as the session cookie
+    id: Mapped[str] = mapped_column(db.String(64), primary_key=True)
+    data: Mapped[str] = mapped_column(db.Text, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(db.DateTime(timezone=True), nullable=False, index=True)
@@ -0,0 +1,146 @@
+import json
+import os
+
+from PIL import Image, ImageSequence
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+IMAGE_DIR = os.path.join(STATIC_DIR, "images")
+OUTPUT_DIR = os.path.join(STATIC_DIR, "optimized")
+MANIFEST = os.path.join(OUTPUT_DIR, "manifest.json")
+# Smaller copies of still images offered to narrow screens, in pixels wide (when narrower than the original)
+WIDTHS = (480, 960)
+
+
+def main():
+    """Re-encode challenge artwork losslessly and record the savings in a manifest.
+
+    Animated GIFs get a lossless animated WebP. Still images get lossless WebP versions at
+    full size and at each of WIDTHS, and PNGs also get a copy with metadata stripped, used as
+    the fallback for older browsers. Variants that are not smaller than the original are dropped.
+    Every output is lossless and encoded with fixed settings, so reruns give identical files.
+
+    Usage: python optimize_images.py
+    """
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    manifest = {}
+    for filename in sorted(image_files()):
+        manifest[filename] = optimize(filename)
+
+    with open(MANIFEST, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+
+    original = sum(entry["original_bytes"] for entry in manifest.values())
+    optimized = sum(entry["optimized_bytes"] for entry in manifest.values())
+    print(f"Optimized {len(manifest)} images into {os.path.relpath(MANIFEST)}.")
+    print(f"Full-size images: {original:,} -> {optimized:,} bytes ({1 - optimized / original:.0%} saved).")
+
+
+def image_files() -> list[str]:
+    """Paths, relative to the static folder, of all GIF and PNG images."""
+    files = []
+    for root, _, names in os.walk(IMAGE_DIR):
+        for name in names:
+            if name.lower().endswith((".gif", ".png")):
+                files.append(os.path.relpath(os.path.join(root, name), STATIC_DIR).replace(os.sep, "/"))
+    return files
+
+
+def optimize(filename: str) -> dict:
+    """Write the optimized variants of one image and describe them for the manifest."""
+    path = os.path.join(STATIC_DIR, filename)
+    stem, ext = os.path.splitext(filename)
+    original_bytes = os.path.getsize(path)
+    entry = {"width": 0, "fallback": None, "sources": [], "original_bytes": original_bytes}
+
+    with Image.open(path) as image:
+        entry["width"] = image.width
+        animated = getattr(image, "n_frames", 1) > 1
+
+        if ext.lower() == ".png":
+            fallback = f"optimized/{filename}"
+            save_png(image, fallback)
+            if size_of(fallback) < original_bytes:
+                entry["fallback"] = fallback
+
+        full = f"optimized/{stem}.webp"
+        if animated:
+            save_animated_webp(image, full)
+        else:
+            save_webp(image.convert("RGBA"), full, image.info.get("icc_profile"))
+        best_fallback = size_of(entry["fallback"]) if entry["fallback"] else original_bytes
+        if size_of(full) >= best_fallback:
+            os.remove(os.path.join(STATIC_DIR, full))
+        else:
+            # Decoding every frame of a long animation at once would need hundreds of MB,
+            # so only still images get the smaller responsive copies
+            for width in (w for w in WIDTHS if w < image.width and not animated):
+                resized = f"optimized/{stem}-{width}w.webp"
+                height = round(image.height * width / image.width)
+                save_webp(image.convert("RGBA").resize((width, height), Image.LANCZOS), resized,
+                          image.info.get("icc_profile"))
+                entry["sources"].append({"path": resized, "width": width, "bytes": size_of(resized)})
+            entry["sources"].append({"path": full, "width": image.width, "bytes": size_of(full)})
+
+    entry["optimized_bytes"] = min(
+        [source["bytes"] for source in entry["sources"] if source["width"] == entry["width"]]
+        + [size_of(entry["fallback"]) if entry["fallback"] else original_bytes]
+    )
+    return entry
+
+
+def save_webp(image: Image.Image, filename: str, icc_profile: bytes | None = None) -> None:
+    """Save a still image as a lossless WebP."""
+    path = os.path.join(STATIC_DIR, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    options = {"lossless": True, "quality": 80, "method": 4, "exact": True}
+    if icc_profile:
+        options["icc_profile"] = icc_profile
+    image.save(path, "WEBP", **options)
+
+
+def save_animated_webp(image: Image.Image, filename: str) -> None:
+    """Save an animated GIF as a lossless animated WebP, decoding one frame at a time.
+
+    Only the first frame is a keyframe, so every later frame is stored as a difference
+    from the previous one, like the GIF itself. A GIF without a loop count plays once,
+    which WebP expresses as loop=1 (0 loops forever). Browsers show GIF frames with a
+    delay of 10ms or less for 100ms, so that timing is kept.
+    """
+    path = os.path.join(STATIC_DIR, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    loop = image.info.get("loop")
+    durations = []
+    for frame in ImageSequence.Iterator(image):
+        duration = frame.info.get("duration", 0)
+        durations.append(duration if duration > 10 else 100)
+    image.seek(0)
+    image.save(
+        path,
+        "WEBP",
+        save_all=True,
+        lossless=True,
+        quality=50,
+        method=2,
+        exact=True,
+        kmin=image.n_frames - 1,
+        kmax=image.n_frames,
+        duration=durations,
+        loop=1 if loop is None else loop,
+    )
+
+
+def save_png(image: Image.Image, filename: str) -> None:
+    """Re-save a PNG with maximum compression, dropping every chunk that does not affect rendering."""
+    path = os.path.join(STATIC_DIR, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    stripped = image.copy()
+    stripped.info = {key: value for key, value in image.info.items() if key in ("transparency", "icc_profile")}
+    stripped.save(path, "PNG", optimize=True)
+
+
+def size_of(filename: str) -> int:
+    return os.path.getsize(os.path.join(STATIC_DIR, filename))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, Request, Response
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSession, SessionInterface
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from models import db, ServerSession
+
+# "postgres" shares sessions between workers; "memory" keeps them in this process, for local development
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "postgres")
+# How long a session lives without being written, and the remaining lifetime below which it is extended
+SESSION_LIFETIME = timedelta(days=30)
+REFRESH_BELOW = SESSION_LIFETIME / 2
+# How long a replaced session id keeps working, for requests already in flight with the old cookie
+REPLACED_GRACE = timedelta(seconds=30)
+# Sessions held in memory per worker, and how long a cached one is trusted before re-reading it
+SESSION_CACHE_SIZE = 4096
+SESSION_CACHE_TTL = 60.0
+
+
+class MemorySessionStore:
+    """Sessions kept in a dict in this process. Only suitable for a single worker."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sessions = {}  # id -> (data, expires_at)
+
+    def get(self, sid: str) -> str | None:
+        with self.lock:
+            data, expires_at = self.sessions.get(sid, (None, None))
+        if data is None or expires_at <= datetime.now(timezone.utc):
+            return None
+        return data
+
+    def save(self, sid: str, data: str, expires_at: datetime) -> None:
+        with self.lock:
+            self.sessions[sid] = (data, expires_at)
+
+    def expire(self, sid: str, expires_at: datetime) -> None:
+        with self.lock:
+            if sid in self.sessions:
+                self.sessions[sid] = (self.sessions[sid][0], expires_at)
+
+    def delete(self, sid: str) -> None:
+        with self.lock:
+            self.sessions.pop(sid, None)
+
+    def expires_at(self, sid: str) -> datetime | None:
+        with self.lock:
+            return self.sessions.get(sid, (None, None))[1]
+
+    def prune(self) -> None:
+        now = datetime.now(timezone.utc)
+        with self.lock:
+            self.sessions = {sid: entry for sid, entry in self.sessions.items() if entry[1] > now}
+
+
+class PostgresSessionStore:
+    """Sessions stored in the `sessions` table, with recently used ones cached in an LRU per worker.
+
+    A session's data is never changed in place: every write stores it under a new id (see
+    ServerSessionInterface), so a cached entry can only go stale by being deleted or expired.
+    Cached entries are re-read after SESSION_CACHE_TTL so deletions made by other workers apply.
+    Ids that are not in the table are cached too, so a stale or made-up cookie costs one query
+    per SESSION_CACHE_TTL rather than one per request.
+    """
+
+    def __init__(self, app: Flask, size: int = SESSION_CACHE_SIZE, ttl: float = SESSION_CACHE_TTL):
+        self.app = app
+        self.size = size
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.cache = OrderedDict()  # id -> (data, expires_at, monotonic time cached); data is None if not found
+
+    def remember(self, sid: str, data: str | None, expires_at: datetime | None) -> None:
+        with self.lock:
+            self.cache[sid] = (data, expires_at, time.monotonic())
+            self.cache.move_to_end(sid)
+            while len(self.cache) > self.size:
+                self.cache.popitem(last=False)
+
+    def forget(self, sid: str) -> None:
+        with self.lock:
+            self.cache.pop(sid, None)
+
+    def cached(self, sid: str) -> tuple[str | None, datetime | None] | None:
+        with self.lock:
+            entry = self.cache.get(sid)
+            if entry is None or time.monotonic() - entry[2] > self.ttl:
+                return None
+            self.cache.move_to_end(sid)
+            return entry[0], entry[1]
+
+    def load(self, sid: str) -> tuple[str, datetime] | None:
+        if (entry := self.cached(sid)) is None:
+            try:
+                row = (
+                    ServerSession.query.with_entities(ServerSession.data, ServerSession.expires_at)
+                    .filter_by(id=sid)
+                    .first()
+                )
+            except Exception as e:
+                self.app.logger.exception(f"Failed to load session: {e}")
+                return None
+            entry = (row.data, row.expires_at) if row is not None else (None, None)
+            self.remember(sid, *entry)
+        return entry if entry[0] is not None else None
+
+    def get(self, sid: str) -> str | None:
+        if (entry := self.load(sid)) is None or entry[1] <= datetime.now(timezone.utc):
+            return None
+        return entry[0]
+
+    def expires_at(self, sid: str) -> datetime | None:
+        entry = self.load(sid)
+        return entry and entry[1]
+
+    def save(self, sid: str, data: str, expires_at: datetime) -> None:
+        statement = insert(ServerSession).values(id=sid, data=data, expires_at=expires_at)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ServerSession.id], set_={"data": data, "expires_at": expires_at}
+        )
+        self.execute(statement)
+        self.remember(sid, data, expires_at)
+
+    def expire(self, sid: str, expires_at: datetime) -> None:
+        self.execute(update(ServerSession).where(ServerSession.id == sid).values(expires_at=expires_at))
+        self.forget(sid)
+
+    def delete(self, sid: str) -> None:
+        self.execute(delete(ServerSession).where(ServerSession.id == sid))
+        self.forget(sid)
+
+    def prune(self) -> None:
+        """Delete expired sessions."""
+        with self.app.app_context():
+            self.execute(delete(ServerSession).where(ServerSession.expires_at < datetime.now(timezone.utc)))
+
+    def execute(self, statement) -> None:
+        try:
+            db.session.execute(statement)
+            db.session.commit()
+        except Exception as e:
+            self.app.logger.exception(f"Failed to write session: {e}")
+            db.session.rollback()
+
+
+class StoredSession(SecureCookieSession):
+    """Session whose data lives in a session store, under the id held in `sid`."""
+
+    def __init__(self, initial: dict | None = None, sid: str | None = None, stale_cookie: bool = False):
+        super().__init__(initial)
+        self.sid = sid
+        # The request carried a session cookie whose id is unknown or expired
+        self.stale_cookie = stale_cookie
+
+
+class ServerSessionInterface(SessionInterface):
+    """Keep session data on the server and only a random session id in the cookie.
+
+    The cookie and the stored data are only written when the session changes, which in this
+    app means logging in, solving a part, or logging out. Every write moves the data to a
+    new id, and the old id keeps working for REPLACED_GRACE so concurrent requests that
+    still carry it are not logged out. Clearing the session deletes it straight away.
+    """
+
+    session_class = StoredSession
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, store: MemorySessionStore | PostgresSessionStore):
+        self.store = store
+
+    def open_session(self, app: Flask, request: Request) -> StoredSession:
+        sid = request.cookies.get(self.get_cookie_name(app))
+        # Cookies longer than an id are left over from the old signed cookie sessions
+        if sid and len(sid) <= 64 and (data := self.store.get(sid)) is not None:
+            try:
+                return self.session_class(self.serializer.loads(data), sid)
+            except ValueError:
+                pass
+        return self.session_class(stale_cookie=bool(sid))
+
+    def save_session(self, app: Flask, session: StoredSession, response: Response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add("Cookie")
+
+        if not session:
+            if session.modified and session.sid:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            elif session.stale_cookie:
+                # Stop the client sending an id that will never be found again
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = datetime.now(timezone.utc)
+        if not session.modified:
+            # Extend sessions that are still in use well before they run out
+            expires_at = self.store.expires_at(session.sid)
+            if expires_at and expires_at - now < REFRESH_BELOW:
+                self.store.expire(session.sid, now + SESSION_LIFETIME)
+            return
+
+        old_sid, session.sid = session.sid, secrets.token_urlsafe(32)
+        self.store.save(session.sid, self.serializer.dumps(dict(session)), now + SESSION_LIFETIME)
+        if old_sid:
+            self.store.expire(old_sid, now + REPLACED_GRACE)
+        response.set_cookie(
+            name,
+            session.sid,
+            domain=domain,
+            path=path,
+            httponly=self.get_cookie_httponly(app),
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+
+
+def session_store(app: Flask) -> MemorySessionStore | PostgresSessionStore:
+    """The session store selected by SESSION_BACKEND."""
+    if SESSION_BACKEND == "memory":
+        return MemorySessionStore()
+    return PostgresSessionStore(app)
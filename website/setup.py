@@ -4,11 +4,15 @@ import sys
 from dotenv import load_dotenv
 from flask import Flask
 from psycopg2 import connect, sql
-from sqlalchemy import inspect
+from sqlalchemy import inspect, text, update
+from sqlalchemy.schema import CreateIndex
 
 from models import (
     db,
+    CACHE_SECTIONS,
+    CacheVersion,
     DiscordID,
+    DiscordJob,
     MainEntry,
     SubEntry,
     Obfuscation,
@@ -16,6 +20,13 @@ from models import (
     Solution,
     Permissions,
     Release,
+    ServerSession,
+    SolveStat,
+    Submission,
+    SubmissionLimit,
+    ALL_SOLVED,
+    WEEKS,
+    progress_bit,
 )
 
 parent_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -51,7 +62,12 @@ def main():
         inspector = inspect(db.engine)
         create_missing_tables(inspector)
         inspector = inspect(db.engine)
+        add_missing_columns(inspector)
+        migrate_progress_bitmask(inspector)
+        drop_unused_indexes()
         fill_permanent_data(inspector)
+        backfill_champions()
+        backfill_solve_stats()
     print("Database setup complete. Go to the Admin dashboard (/admin) to customize for your server.")
 
 
@@ -84,12 +100,96 @@ def create_missing_tables(inspector):
     """Check and create all tables only if they don't already exist"""
     with app.app_context():
         table_names = inspector.get_table_names()
-        for model in [DiscordID, MainEntry, SubEntry, Obfuscation, Progress, Solution, Permissions, Release]:
+        for model in [DiscordID, MainEntry, SubEntry, Obfuscation, Progress, Solution, Permissions, Release, CacheVersion, DiscordJob, SubmissionLimit, Submission, SolveStat, ServerSession]:
             if model.__tablename__ not in table_names:
                 model.__table__.create(db.engine)
                 print(f"Table ({model.__tablename__}) created.")
 
 
+def add_missing_columns(inspector):
+    """Add columns introduced after a table was first created to existing tables"""
+    with app.app_context():
+        table_names = inspector.get_table_names()
+        for model in [Progress]:
+            if model.__tablename__ not in table_names:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(model.__tablename__)}
+            for column in model.__table__.columns:
+                if column.name in existing:
+                    continue
+                ddl = f'ALTER TABLE {model.__tablename__} ADD COLUMN "{column.name}" '
+                ddl += column.type.compile(dialect=db.engine.dialect)
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable:
+                    ddl += " NOT NULL"
+                db.session.execute(text(ddl))
+                for index in model.__table__.indexes:
+                    if column.name in index.columns:
+                        db.session.execute(CreateIndex(index, if_not_exists=True))
+                print(f"Column ({model.__tablename__}.{column.name}) added.")
+        db.session.commit()
+
+
+def migrate_progress_bitmask(inspector):
+    """Fold the old c1..c10 boolean array columns of progress into the solved bitmask, then drop them"""
+    with app.app_context():
+        if "progress" not in inspector.get_table_names():
+            return
+        existing = {column["name"] for column in inspector.get_columns("progress")}
+        old_columns = [f"c{week}" for week in range(1, WEEKS + 1) if f"c{week}" in existing]
+        if not old_columns:
+            return
+        bits = " | ".join(
+            f"(CASE WHEN {column}[{part + 1}] THEN {progress_bit(int(column[1:]), part)} ELSE 0 END)"
+            for column in old_columns
+            for part in (0, 1)
+        )
+        db.session.execute(text(f"UPDATE progress SET solved = solved | {bits}"))
+        db.session.execute(text(f"ALTER TABLE progress {', '.join(f'DROP COLUMN {c}' for c in old_columns)}"))
+        db.session.commit()
+        print("Migrated progress columns c1..c10 to the solved bitmask.")
+
+
+def drop_unused_indexes():
+    """Drop indexes that earlier versions created but no query uses"""
+    with app.app_context():
+        db.session.execute(text("DROP INDEX IF EXISTS ix_progress_solved"))
+        db.session.commit()
+
+
+def backfill_champions():
+    """Give users who completed every challenge before completion times were recorded a finish time"""
+    with app.app_context():
+        result = db.session.execute(
+            update(Progress)
+            .where(Progress.completed_at.is_(None), Progress.solved == ALL_SOLVED)
+            .values(completed_at=db.func.now())
+        )
+        db.session.commit()
+        if result.rowcount:
+            print(f"Recorded completion time for {result.rowcount} existing champions.")
+
+
+def backfill_solve_stats():
+    """Count existing users and solves into solve_stats the first time it is created"""
+    with app.app_context():
+        if db.session.query(SolveStat).first():
+            return
+        counts = [db.func.count()] + [
+            db.func.count().filter(Progress.solved.op("&")(progress_bit(week, part)) != 0)
+            for week in range(1, WEEKS + 1)
+            for part in (0, 1)
+        ]
+        users, *solves = db.session.query(*counts).one()
+        stats = [SolveStat(week=0, part=0, count=users)]
+        for n, count in enumerate(solves):
+            stats.append(SolveStat(week=n // 2 + 1, part=n % 2 + 1, count=count))
+        db.session.add_all(stats)
+        db.session.commit()
+        print(f"Counted solves of {users} existing users.")
+
+
 def fill_permanent_data(inspector):
     """Add initial data to the tables if they're empty"""
     with app.app_context():
@@ -106,6 +206,13 @@ def fill_permanent_data(inspector):
                 db.session.add(release)
                 print("Inserted initial release number.")
 
+        if "cache_versions" in table_names:
+            existing_sections = {section for (section,) in db.session.query(CacheVersion.section).all()}
+            for section in CACHE_SECTIONS:
+                if section not in existing_sections:
+                    db.session.add(CacheVersion(section=section, version=0))
+                    print(f"Inserted cache version for {section}.")
+
         if "permissions" in table_names:
             if not db.session.query(Permissions).first():
                 # If the table is blank
@@ -0,0 +1,101 @@
+"""Reference solvers for every part of every week.
+
+Each solver takes the contents of its puzzle input, as text or, for PNG inputs, as an RGB
+PIL image, and returns the answer as a player would type it. check_solutions.py runs them
+against static/puzzle_input/ and compares the results with the Solution seed data.
+
+Some parts also have a naive solver, the straightforward approach the puzzle is meant to
+reward improving on, and an enlarger that builds a bigger input of the same shape from the
+shared one. benchmarks/puzzle_difficulty.py uses them to profile how hard each input is.
+
+Parts whose inputs are large numeric grids have NumPy versions too. NumPy is optional:
+without it they are not registered, and only the pure Python solvers run.
+"""
+import os
+from typing import Callable, NamedTuple
+
+from PIL import Image
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PUZZLE_INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static", "puzzle_input")
+
+
+class Solver(NamedTuple):
+    function: Callable[[str | Image.Image], str]
+    filename: str
+
+
+# (week, part) -> Solver
+SOLVERS = {}
+# (week, part) -> naive solver, taking and returning the same as the reference one
+NAIVE_SOLVERS = {}
+# (week, part) -> function(puzzle input, factor) returning an input about `factor` times as large
+ENLARGERS = {}
+# (week, part) -> NumPy solver, taking and returning the same as the reference one
+VECTORIZED_SOLVERS = {}
+
+
+def register(week: int, part: int, filename: str | None = None) -> Callable:
+    """Register the solver for one part of a week. `filename` defaults to input<part>.txt."""
+    def decorator(function: Callable[[str | Image.Image], str]) -> Callable:
+        SOLVERS[(week, part)] = Solver(function, filename or f"input{part}.txt")
+        return function
+    return decorator
+
+
+def register_naive(week: int, part: int) -> Callable:
+    """Register the naive solver for one part of a week."""
+    def decorator(function: Callable[[str], str]) -> Callable:
+        NAIVE_SOLVERS[(week, part)] = function
+        return function
+    return decorator
+
+
+def register_enlarger(week: int, part: int) -> Callable:
+    """Register the function that enlarges one part's input."""
+    def decorator(function: Callable[[str, int], str]) -> Callable:
+        ENLARGERS[(week, part)] = function
+        return function
+    return decorator
+
+
+def register_vectorized(week: int, part: int) -> Callable:
+    """Register the NumPy solver for one part of a week, if NumPy is installed."""
+    def decorator(function: Callable[[str], str]) -> Callable:
+        if numpy is not None:
+            VECTORIZED_SOLVERS[(week, part)] = function
+        return function
+    return decorator
+
+
+def input_path(week: int, part: int) -> str:
+    """Path of the shared puzzle input a part is solved from."""
+    return os.path.join(PUZZLE_INPUT_DIR, f"{week:02d}", SOLVERS[(week, part)].filename)
+
+
+def read_input(path: str) -> str | Image.Image:
+    """Read a puzzle input: PNGs as RGB images, everything else as UTF-8 text."""
+    if path.endswith(".png"):
+        with Image.open(path) as image:
+            return image.convert("RGB")
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def solve(week: int, part: int, puzzle_input: str | Image.Image | None = None) -> str:
+    """Solve one part of a week, from its shared input unless another one is given."""
+    if puzzle_input is None:
+        puzzle_input = read_input(input_path(week, part))
+    return SOLVERS[(week, part)].function(puzzle_input)
+
+
+def normalize_answer(answer: str) -> str:
+    """The same normalization DataCache.normalize_answer applies to guesses."""
+    return answer.replace("_", " ").upper().strip()
+
+
+from solvers import week01, week02, week03, week04, week05, week06, week07, week08, week09, week10  # noqa: E402,F401
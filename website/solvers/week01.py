@@ -0,0 +1,19 @@
+from generators.week01 import ALIEN_MARK, MORSE
+from solvers import register
+
+# Morse code -> character
+LETTERS = {code: letter for letter, code in MORSE.items()}
+
+
+@register(1, 1)
+def morse_message(puzzle_input: str) -> str:
+    """One word per line, with a space between the Morse codes of its letters."""
+    return " ".join("".join(LETTERS[code] for code in line.split()) for line in puzzle_input.splitlines())
+
+
+@register(1, 2)
+def alien_word(puzzle_input: str) -> str:
+    """Ordinals -> one binary number -> Morse code, with letters separated by the alien mark."""
+    number = int("".join(str(ord(c)) for c in puzzle_input.strip()))
+    morse = f"{number:b}".replace("0", ".").replace("1", "_")
+    return "".join(LETTERS[code] for code in morse.split(ALIEN_MARK) if code)
@@ -0,0 +1,35 @@
+import string
+
+from generators.week02 import BRAILLE
+from solvers import register
+
+# Raised dots -> character
+LETTERS = {dots: letter for letter, dots in BRAILLE.items()}
+# Order of the column headers of the BrailLED panel
+HEADERS = string.ascii_uppercase + string.ascii_lowercase
+
+
+@register(2, 1)
+def sorted_pages(puzzle_input: str) -> str:
+    """First letters of the page titles, sorted by chapter, subchapter and section."""
+    pages = [line.rsplit(",", 3) for line in puzzle_input.splitlines()[1:] if line]
+    pages.sort(key=lambda page: (int(page[1]), page[2], int(page[3])))
+    return "".join(title[0] for title, *_ in pages)
+
+
+@register(2, 2)
+def brailled_panel(puzzle_input: str) -> str:
+    """Panel columns in header order, read as two rows of Braille cells two columns wide.
+
+    Each column holds six lights: the top three belong to a cell of the first row and the
+    bottom three to a cell of the second row. A cell's left column has dots 1-3, its right 4-6.
+    """
+    columns = [line.split(",") for line in puzzle_input.split()]
+    columns = [lights for lights, _ in sorted(columns, key=lambda column: HEADERS.index(column[1]))]
+    message = []
+    for row in (0, 3):
+        for left, right in zip(columns[::2], columns[1::2]):
+            dots = [str(dot + 1) for dot in range(3) if left[row + dot] == "1"]
+            dots += [str(dot + 4) for dot in range(3) if right[row + dot] == "1"]
+            message.append(LETTERS["".join(dots)])
+    return "".join(message)
@@ -0,0 +1,45 @@
+from collections import deque
+
+from solvers import register
+
+# Dispensers in the Cargo Hold, numbered from 0
+DISPENSERS = 40
+
+
+@register(3, 1)
+def cargo_order(puzzle_input: str) -> str:
+    """Capsules at the bottom of each dispenser after running the robotic arm's commands."""
+    return run_arm(puzzle_input, shift=False)
+
+
+@register(3, 2)
+def blunder_belt(puzzle_input: str) -> str:
+    """As part 1, with the conveyor belt shifting every dispenser left after each Take."""
+    return run_arm(puzzle_input, shift=True)
+
+
+def run_arm(puzzle_input: str, shift: bool) -> str:
+    """Run the commands against the dispensers, listed bottom to top, and release one capsule from each.
+
+    The C-shaped tube is first in, first out: capsules enter at one end and are dropped from the other.
+    """
+    lines = puzzle_input.split("\n")
+    position, commands = int(lines[0]), lines[1].split(",")
+    dispensers = [deque(line.split(",")) if line else deque() for line in lines[2:2 + DISPENSERS]]
+    dispensers += [deque() for _ in range(DISPENSERS - len(dispensers))]
+    tube = deque()
+    for command in commands:
+        action, count = command[0], int(command[1:])
+        if action == "R":
+            position = (position + count) % DISPENSERS
+        elif action == "L":
+            position = (position - count) % DISPENSERS
+        elif action == "T":
+            for _ in range(count):
+                tube.append(dispensers[position].popleft())
+            if shift:
+                dispensers.append(dispensers.pop(0))
+        elif action == "D":
+            for _ in range(count):
+                dispensers[position].append(tube.popleft())
+    return "".join(dispenser[0] for dispenser in dispensers if dispenser)
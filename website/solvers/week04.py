@@ -0,0 +1,160 @@
+import io
+import re
+
+from solvers import register, register_enlarger, register_naive, register_vectorized
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# A bloom of algae: mass(x,y)
+BLOOM = re.compile(r"(\d+)\((\d+),(\d+)\)")
+# Neighbours of a cell in the concentration grid
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+
+@register(4, 1)
+def center_of_flavor(puzzle_input: str) -> str:
+    """Centers of mass of each line's blooms, read as the character codes of two words."""
+    xs, ys = [], []
+    for line in puzzle_input.splitlines():
+        blooms = [tuple(map(int, bloom)) for bloom in BLOOM.findall(line)]
+        if not blooms:
+            continue
+        mass = sum(m for m, _, _ in blooms)
+        xs.append(chr(sum(m * x for m, x, _ in blooms) // mass))
+        ys.append(chr(sum(m * y for m, _, y in blooms) // mass))
+    return f"{''.join(xs)} {''.join(ys)}"
+
+
+@register(4, 2)
+def center_of_mass(puzzle_input: str) -> str:
+    """Center of mass, as "x,y", of the heaviest cluster of adjacent non-zero cells."""
+    grid = concentration_grid(puzzle_input)
+    height, width = len(grid), len(grid[0])
+    seen = [[False] * width for _ in range(height)]
+    heaviest = (0, 0, 0)  # mass, mass-weighted x, mass-weighted y
+    for start_y in range(height):
+        for start_x in range(width):
+            if not grid[start_y][start_x] or seen[start_y][start_x]:
+                continue
+            seen[start_y][start_x] = True
+            stack = [(start_x, start_y)]
+            mass = mass_x = mass_y = 0
+            while stack:
+                x, y = stack.pop()
+                value = grid[y][x]
+                mass, mass_x, mass_y = mass + value, mass_x + value * x, mass_y + value * y
+                for dx, dy in NEIGHBOURS:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] and not seen[ny][nx]:
+                        seen[ny][nx] = True
+                        stack.append((nx, ny))
+            if mass > heaviest[0]:
+                heaviest = (mass, mass_x, mass_y)
+    mass, mass_x, mass_y = heaviest
+    return f"{mass_x // mass},{mass_y // mass}"
+
+
+@register_naive(4, 2)
+def center_of_mass_by_relabeling(puzzle_input: str) -> str:
+    """As center_of_mass, but labels clusters by sweeping the grid until no label changes.
+
+    Every non-zero cell starts with its own label and takes the smallest label among its
+    neighbours on each sweep, so a cluster needs about as many sweeps as it is long.
+    """
+    grid = concentration_grid(puzzle_input)
+    height, width = len(grid), len(grid[0])
+    labels = [[y * width + x + 1 if grid[y][x] else 0 for x in range(width)] for y in range(height)]
+    changed = True
+    while changed:
+        changed = False
+        for y in range(height):
+            for x in range(width):
+                if not labels[y][x]:
+                    continue
+                smallest = labels[y][x]
+                for dx, dy in NEIGHBOURS:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height and labels[ny][nx]:
+                        smallest = min(smallest, labels[ny][nx])
+                if smallest < labels[y][x]:
+                    labels[y][x] = smallest
+                    changed = True
+
+    clusters = {}  # label -> [mass, mass-weighted x, mass-weighted y]
+    for y in range(height):
+        for x in range(width):
+            if labels[y][x]:
+                cluster = clusters.setdefault(labels[y][x], [0, 0, 0])
+                cluster[0] += grid[y][x]
+                cluster[1] += grid[y][x] * x
+                cluster[2] += grid[y][x] * y
+    mass, mass_x, mass_y = max(clusters.values(), key=lambda cluster: cluster[0])
+    return f"{mass_x // mass},{mass_y // mass}"
+
+
+@register_enlarger(4, 2)
+def wider_grid(puzzle_input: str, factor: int) -> str:
+    """The grid repeated `factor` times side by side."""
+    return "\n".join(",".join([line] * factor) for line in puzzle_input.split())
+
+
+@register_vectorized(4, 1)
+def center_of_flavor_vectorized(puzzle_input: str) -> str:
+    """As center_of_flavor, with every bloom parsed at once and summed per line with bincount."""
+    blooms = np.array(BLOOM.findall(puzzle_input), dtype=np.int64).reshape(-1, 3)
+    text = np.frombuffer(puzzle_input.encode(), dtype=np.uint8)
+    # A bloom's line is the number of line breaks before its opening bracket
+    lines = np.searchsorted(np.flatnonzero(text == ord("\n")), np.flatnonzero(text == ord("(")))
+    mass, x, y = blooms.T
+    total = np.bincount(lines, weights=mass).astype(np.int64)
+    xs = np.bincount(lines, weights=mass * x).astype(np.int64)
+    ys = np.bincount(lines, weights=mass * y).astype(np.int64)
+    found = total > 0
+    return f"{characters(xs[found] // total[found])} {characters(ys[found] // total[found])}"
+
+
+@register_vectorized(4, 2)
+def center_of_mass_vectorized(puzzle_input: str) -> str:
+    """As center_of_mass, labelling clusters with array-wide union-find instead of a flood fill.
+
+    Each cell starts as its own root. Every round hooks the larger of each pair of adjacent
+    roots onto the smaller, then jumps every cell to its root, so clusters merge along all
+    their edges at once instead of one cell at a time.
+    """
+    grid = np.loadtxt(io.StringIO(puzzle_input), delimiter=",", dtype=np.int64, ndmin=2)
+    filled = grid != 0
+    # Only non-zero cells take part, numbered in reading order
+    cells = np.cumsum(filled).reshape(grid.shape) - 1
+    across = filled[:, :-1] & filled[:, 1:]
+    down = filled[:-1, :] & filled[1:, :]
+    first = np.concatenate([cells[:, :-1][across], cells[:-1, :][down]])
+    second = np.concatenate([cells[:, 1:][across], cells[1:, :][down]])
+
+    roots = np.arange(int(filled.sum()))
+    while True:
+        a, b = roots[first], roots[second]
+        joined = a != b
+        if not joined.any():
+            break
+        np.minimum.at(roots, np.maximum(a, b)[joined], np.minimum(a, b)[joined])
+        while (roots != roots[roots]).any():
+            roots = roots[roots]
+
+    values = grid[filled]
+    ys, xs = np.nonzero(filled)
+    mass = np.bincount(roots, weights=values)
+    # Ties go to the cluster found first in reading order, whose root is the smallest
+    in_cluster = roots == np.argmax(mass)
+    total = int(values[in_cluster].sum())
+    return f"{int((values * xs)[in_cluster].sum()) // total},{int((values * ys)[in_cluster].sum()) // total}"
+
+
+def characters(codes: "np.ndarray") -> str:
+    return "".join(map(chr, codes.tolist()))
+
+
+def concentration_grid(puzzle_input: str) -> list[list[int]]:
+    return [list(map(int, line.split(","))) for line in puzzle_input.split()]
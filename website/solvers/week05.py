@@ -0,0 +1,119 @@
+import math
+
+from PIL import Image, ImageFilter
+
+from solvers import register
+
+# Colour of the digits hidden in the unwrapped wire
+INK = (0, 0, 0)
+# Size of the square used to erase the thin stray lines crossing the digits, in pixels
+STROKE = 7
+# Smallest blob, in pixels, taken for a digit rather than noise left over after erasing
+MIN_DIGIT_AREA = 300
+# Horizontal bands a digit is split into when measuring its shape
+BANDS = 5
+
+
+@register(5, 1, "input1.png")
+def zigzag_wire(puzzle_input: Image.Image) -> str:
+    """The wire wound back and forth into a square, every other row running right to left."""
+    pixels = list(puzzle_input.getdata())
+    size = math.isqrt(len(pixels))
+    ink = [[False] * size for _ in range(size)]
+    for i, pixel in enumerate(pixels):
+        y, x = divmod(i, size)
+        ink[y][size - 1 - x if y % 2 else x] = pixel == INK
+    return read_digits(ink)
+
+
+@register(5, 2, "input2.png")
+def diagonal_wire(puzzle_input: Image.Image) -> str:
+    """The wire wound along the anti-diagonals of a square, alternating direction."""
+    pixels = iter(puzzle_input.getdata())
+    size = math.isqrt(puzzle_input.width * puzzle_input.height)
+    ink = [[False] * size for _ in range(size)]
+    for diagonal in range(2 * size - 1):
+        xs = range(max(0, diagonal - size + 1), min(diagonal, size - 1) + 1)
+        for x in reversed(xs) if diagonal % 2 else xs:
+            ink[diagonal - x][x] = next(pixels) == INK
+    return read_digits(ink)
+
+
+def read_digits(ink: list[list[bool]]) -> str:
+    """Digits drawn in the ink mask, left to right."""
+    size = len(ink)
+    mask = Image.new("L", (size, size))
+    mask.putdata([255 if inked else 0 for row in ink for inked in row])
+    mask = mask.filter(ImageFilter.MinFilter(STROKE)).filter(ImageFilter.MaxFilter(STROKE))
+    values = list(mask.getdata())
+    opened = [[value > 0 for value in values[y * size:(y + 1) * size]] for y in range(size)]
+    digits = [blob for blob in blobs(opened, diagonal=True) if len(blob) >= MIN_DIGIT_AREA]
+    digits.sort(key=lambda blob: min(x for x, _ in blob))
+    return "".join(read_digit(crop(blob)) for blob in digits)
+
+
+def blobs(mask: list[list[bool]], diagonal: bool) -> list[list[tuple[int, int]]]:
+    """Connected groups of set cells, with or without diagonal neighbours."""
+    height, width = len(mask), len(mask[0])
+    steps = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if (dx or dy) and (diagonal or not (dx and dy))]
+    seen = [[False] * width for _ in range(height)]
+    found = []
+    for start_y in range(height):
+        for start_x in range(width):
+            if not mask[start_y][start_x] or seen[start_y][start_x]:
+                continue
+            seen[start_y][start_x] = True
+            stack, blob = [(start_x, start_y)], []
+            while stack:
+                x, y = stack.pop()
+                blob.append((x, y))
+                for dx, dy in steps:
+                    nx, ny = x + dx, y + dy
+                    if 0 <= nx < width and 0 <= ny < height and mask[ny][nx] and not seen[ny][nx]:
+                        seen[ny][nx] = True
+                        stack.append((nx, ny))
+            found.append(blob)
+    return found
+
+
+def crop(blob: list[tuple[int, int]]) -> list[list[bool]]:
+    """The blob as a mask just large enough to hold it."""
+    left, top = min(x for x, _ in blob), min(y for _, y in blob)
+    width, height = max(x for x, _ in blob) - left + 1, max(y for _, y in blob) - top + 1
+    glyph = [[False] * width for _ in range(height)]
+    for x, y in blob:
+        glyph[y - top][x - left] = True
+    return glyph
+
+
+def read_digit(glyph: list[list[bool]]) -> str:
+    """Tell a digit apart by its enclosed holes and, without holes, by where its strokes lie."""
+    height, width = len(glyph), len(glyph[0])
+    holes = []  # (vertical center, height) of each hole, relative to the glyph's height
+    for blob in blobs([[not inked for inked in row] for row in glyph], diagonal=False):
+        ys = [y for _, y in blob]
+        touches_edge = any(x in (0, width - 1) or y in (0, height - 1) for x, y in blob)
+        if not touches_edge and len(blob) >= 0.01 * width * height:
+            holes.append(((min(ys) + max(ys)) / 2 / height, (max(ys) - min(ys)) / height))
+
+    bands = []  # (leftmost, rightmost, mean) inked x of each band, relative to the glyph's width
+    for band in range(BANDS):
+        xs = [x for y in range(band * height // BANDS, (band + 1) * height // BANDS) for x in range(width) if glyph[y][x]]
+        bands.append((min(xs) / width, max(xs) / width, sum(xs) / len(xs) / width))
+
+    if len(holes) >= 2:
+        return "8"
+    if holes:
+        center, hole_height = holes[0]
+        if hole_height >= 0.6:
+            return "0"
+        if center > 0.55:
+            return "6"
+        return "4" if bands[4][2] > 0.6 else "9"
+    if bands[4][1] - bands[4][0] < 0.5:
+        return "7"
+    if bands[2][1] - bands[2][0] < 0.35:
+        return "1"
+    if bands[1][2] < 0.5:
+        return "5"
+    return "3" if bands[3][2] > 0.6 else "2"
@@ -0,0 +1,58 @@
+import heapq
+import math
+from collections import Counter
+
+from generators.week06 import NEIGHBOURS
+from solvers import register, register_enlarger, register_naive
+
+
+@register(6, 1)
+def material_types(puzzle_input: str) -> str:
+    """First letters of the types of the unknown samples on the first line, by nearest neighbours."""
+    lines = puzzle_input.splitlines()
+    unknown = [tuple(map(float, sample.split(","))) for sample in lines[0].split()]
+    samples = []
+    for line in lines[1:]:
+        if line:
+            *features, kind = line.split(",", 2)
+            samples.append((tuple(map(float, features)), kind))
+    return "".join(classify(target, samples)[0] for target in unknown)
+
+
+@register(6, 2)
+def heat_sink(puzzle_input: str) -> str:
+    """Type of the unknown five-feature sample on the first line, by nearest neighbours."""
+    return classify(*heat_sink_samples(puzzle_input))
+
+
+@register_naive(6, 2)
+def heat_sink_by_sorting(puzzle_input: str) -> str:
+    """As heat_sink, but sorts every sample by distance to find the nearest ones."""
+    target, samples = heat_sink_samples(puzzle_input)
+    nearest = sorted(samples, key=lambda sample: math.dist(target, sample[0]))[:NEIGHBOURS]
+    return Counter(kind for _, kind in nearest).most_common(1)[0][0]
+
+
+@register_enlarger(6, 2)
+def more_heat_sinks(puzzle_input: str, factor: int) -> str:
+    """The known samples repeated `factor` times."""
+    target, samples = puzzle_input.split("\n", 1)
+    return "\n".join([target] + [samples.rstrip("\n")] * factor)
+
+
+def heat_sink_samples(puzzle_input: str) -> tuple[tuple[float, ...], list[tuple[tuple[float, ...], str]]]:
+    """The unknown sample on the first line, and the known samples with their types."""
+    lines = puzzle_input.splitlines()
+    target = tuple(map(float, lines[0].split(",")))
+    samples = []
+    for line in lines[1:]:
+        if line:
+            *features, kind = line.split(",", len(target))
+            samples.append((tuple(map(float, features)), kind))
+    return target, samples
+
+
+def classify(target: tuple[float, ...], samples: list[tuple[tuple[float, ...], str]]) -> str:
+    """Most common type among the NEIGHBOURS samples closest to the target."""
+    nearest = heapq.nsmallest(NEIGHBOURS, samples, key=lambda sample: math.dist(target, sample[0]))
+    return Counter(kind for _, kind in nearest).most_common(1)[0][0]
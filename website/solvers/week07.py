@@ -0,0 +1,30 @@
+from collections import Counter
+
+from PIL import Image
+
+from generators.week07 import REQUESTED
+from solvers import register
+
+# Length of an item code in the raw inventory file
+CODE_LENGTH = 4
+# Colours read as words, with digits swapped for the letters they look like
+LEET = str.maketrans("0123456789", "OIZEASGTBP")
+# Colours that make up the access code
+ACCESS_COLOURS = 3
+
+
+@register(7, 1)
+def raw_data_file(puzzle_input: str) -> str:
+    """Codes of the requested items, found by how many times each code appears."""
+    end = len(puzzle_input) - len(puzzle_input) % CODE_LENGTH
+    quantities = Counter(puzzle_input[i:i + CODE_LENGTH] for i in range(0, end, CODE_LENGTH))
+    codes = {quantity: code for code, quantity in quantities.items()}
+    return "".join(codes[quantity] for quantity in REQUESTED)
+
+
+@register(7, 2, "input2.png")
+def access_code(puzzle_input: Image.Image) -> str:
+    """Hex codes of the most common colours, most common first, read as words."""
+    colours = puzzle_input.getcolors(puzzle_input.width * puzzle_input.height)
+    colours.sort(reverse=True)
+    return " ".join(f"{r:02X}{g:02X}{b:02X}".translate(LEET) for _, (r, g, b) in colours[:ACCESS_COLOURS])
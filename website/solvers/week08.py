@@ -0,0 +1,80 @@
+import csv
+import io
+from typing import NamedTuple
+
+from generators.week08 import SHELF, SHELVES
+from solvers import register, register_enlarger, register_naive
+
+
+class CoffeeBag(NamedTuple):
+    country: str
+    bean: str
+    roast: str
+    width: int
+    rating: int
+
+
+def coffee_bags(puzzle_input: str) -> list[CoffeeBag]:
+    return [
+        CoffeeBag(row["country"], row["bean"], row["roast"], int(row["width"]), int(row["rating"]))
+        for row in csv.DictReader(io.StringIO(puzzle_input))
+    ]
+
+
+@register(8, 1)
+def full_of_beans(puzzle_input: str) -> str:
+    """Best total rating of bags fitting on one shelf: a 0/1 knapsack over widths."""
+    best = [0] * (SHELF + 1)
+    for bag in coffee_bags(puzzle_input):
+        for width in range(SHELF, bag.width - 1, -1):
+            best[width] = max(best[width], best[width - bag.width] + bag.rating)
+    return str(best[SHELF])
+
+
+@register_naive(8, 1)
+def full_of_beans_by_search(puzzle_input: str) -> str:
+    """As full_of_beans, but tries every set of bags that fits, by including or leaving out each bag in turn."""
+    bags = coffee_bags(puzzle_input)
+
+    def best(i: int, space: int) -> int:
+        if i == len(bags):
+            return 0
+        left_out = best(i + 1, space)
+        if bags[i].width > space:
+            return left_out
+        return max(left_out, bags[i].rating + best(i + 1, space - bags[i].width))
+
+    return str(best(0, SHELF))
+
+
+@register_enlarger(8, 1)
+def bigger_shipment(puzzle_input: str, factor: int) -> str:
+    """The inventory with every bag repeated `factor` times."""
+    header, bags = puzzle_input.split("\n", 1)
+    return "\n".join([header] + [bags.rstrip("\n")] * factor)
+
+
+@register(8, 2)
+def bean_around_the_world(puzzle_input: str) -> str:
+    """Sum of the ratings of the three shelves, stocked in order without reusing bags.
+
+    This is the method the published answer was computed with: the part 1 table, with bags
+    added from least to most popular, keeping one set of bags per width and skipping a bag
+    whose bean or roast is already in that set. It is not exhaustive. Searching every set
+    of distinct beans and roasts for each shelf in turn finds 1615 rather than 1603.
+    """
+    bags = sorted(coffee_bags(puzzle_input), key=lambda bag: bag.rating)
+    total = 0
+    for shelf in SHELVES:
+        best = [(0, ())] * (shelf + 1)  # (rating, bags) per width used
+        for i, bag in enumerate(bags):
+            for width in range(shelf, bag.width - 1, -1):
+                rating, chosen = best[width - bag.width]
+                if any(bags[j].bean == bag.bean or bags[j].roast == bag.roast for j in chosen):
+                    continue
+                if rating + bag.rating > best[width][0]:
+                    best[width] = (rating + bag.rating, chosen + (i,))
+        rating, chosen = max(best)
+        total += rating
+        bags = [bag for i, bag in enumerate(bags) if i not in chosen]
+    return str(total)
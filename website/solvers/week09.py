@@ -0,0 +1,98 @@
+import math
+from collections import deque
+
+from solvers import register, register_enlarger, register_naive
+
+
+@register(9, 1)
+def nebula_labyrinth(puzzle_input: str) -> str:
+    return str(shortest_path(puzzle_input))
+
+
+@register(9, 2)
+def wormholes(puzzle_input: str) -> str:
+    return str(shortest_path(puzzle_input))
+
+
+@register_naive(9, 1)
+@register_naive(9, 2)
+def every_path(puzzle_input: str) -> str:
+    """Follow every path depth first, keeping the shortest one found.
+
+    Paths already as long as the shortest one found are abandoned, but the search still has
+    to try each of a wormhole's connections in turn before it can rule any of them out.
+    """
+    start, end, connections = node_map(puzzle_input)
+    shortest = math.inf
+    on_path = {start}
+    stack = [(start, iter(connections.get(start, ())))]
+    while stack:
+        node, unexplored = stack[-1]
+        linked = next(unexplored, None)
+        if linked is None:
+            stack.pop()
+            on_path.discard(node)
+        elif linked in on_path or len(stack) + 1 >= shortest:
+            continue
+        elif linked == end:
+            shortest = len(stack) + 1
+        else:
+            on_path.add(linked)
+            stack.append((linked, iter(connections.get(linked, ()))))
+    if shortest == math.inf:
+        raise ValueError(f"No path from {start} to {end}")
+    return str(shortest)
+
+
+@register_enlarger(9, 1)
+@register_enlarger(9, 2)
+def chained_maps(puzzle_input: str, factor: int) -> str:
+    """`factor` copies of the map, each one's end joined to the next one's start.
+
+    Nodes of each copy are numbered after those of the copy before it, so the shortest path
+    is `factor` times as long.
+    """
+    start, end, connections = node_map(puzzle_input)
+    offset = max(int(node) for others in connections.values() for node in others) + 1
+    lines = [f"{start},{int(end) + (factor - 1) * offset}"]
+    for copy in range(factor):
+        shift = copy * offset
+        for node, others in connections.items():
+            others = [int(other) + shift for other in others]
+            if node == end and copy < factor - 1:
+                others.append(int(start) + shift + offset)
+            if node == start and copy > 0:
+                others.append(int(end) + shift - offset)
+            lines.append(f"{int(node) + shift}:{','.join(map(str, others))}")
+    return "\n".join(lines)
+
+
+def node_map(puzzle_input: str) -> tuple[str, str, dict[str, list[str]]]:
+    """The start and end nodes, and the nodes each node connects to."""
+    lines = puzzle_input.split()
+    start, end = lines[0].split(",")
+    connections = {}
+    for line in lines[1:]:
+        node, linked = line.split(":")
+        connections[node] = linked.split(",")
+    return start, end, connections
+
+
+def shortest_path(puzzle_input: str) -> int:
+    """Nodes on the shortest path from the first line's start to its end, both included.
+
+    A breadth-first search, so a wormhole's many connections are each queued once instead of
+    being followed to the end one after another.
+    """
+    start, end, connections = node_map(puzzle_input)
+    nodes = {start: 1}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == end:
+            return nodes[node]
+        for linked in connections.get(node, ()):
+            if linked not in nodes:
+                nodes[linked] = nodes[node] + 1
+                queue.append(linked)
+    raise ValueError(f"No path from {start} to {end}")
@@ -0,0 +1,99 @@
+import math
+from collections import defaultdict, deque
+
+from generators.week10 import DOME_SOURCE, DOME_TARGETS
+from solvers import register, register_enlarger, register_naive
+
+# Sources and destinations from the instructions of each part
+HALLWAYS = ("S1", ("MD",))
+BATTLE_DOME = (DOME_SOURCE, DOME_TARGETS)
+# Node joining several destinations, through edges of unlimited capacity
+SINK = "sink"
+
+
+@register(10, 1)
+def all_hands_on_deck(puzzle_input: str) -> str:
+    return str(max_flow(puzzle_input, *HALLWAYS))
+
+
+@register(10, 2)
+def battle_dome(puzzle_input: str) -> str:
+    return str(max_flow(puzzle_input, *BATTLE_DOME))
+
+
+@register_naive(10, 1)
+def all_hands_depth_first(puzzle_input: str) -> str:
+    return str(max_flow(puzzle_input, *HALLWAYS, depth_first=True))
+
+
+@register_naive(10, 2)
+def battle_dome_depth_first(puzzle_input: str) -> str:
+    return str(max_flow(puzzle_input, *BATTLE_DOME, depth_first=True))
+
+
+@register_enlarger(10, 1)
+def more_hallways(puzzle_input: str, factor: int) -> str:
+    return parallel_copies(puzzle_input, factor, *HALLWAYS)
+
+
+@register_enlarger(10, 2)
+def bigger_dome(puzzle_input: str, factor: int) -> str:
+    return parallel_copies(puzzle_input, factor, *BATTLE_DOME)
+
+
+def parallel_copies(puzzle_input: str, factor: int, source: str, destinations: tuple[str, ...]) -> str:
+    """`factor` copies of the graph sharing only the source and destinations, so the flow is `factor` times larger."""
+    shared = {source, *destinations}
+    lines = []
+    for copy in range(factor):
+        for line in puzzle_input.splitlines():
+            if line.strip():
+                edge, capacity = line.split()
+                nodes = [node if node in shared else f"{node}_{copy}" for node in edge.split("-")]
+                lines.append(f"{'-'.join(nodes)} {capacity}")
+    return "\n".join(lines)
+
+
+def max_flow(puzzle_input: str, source: str, destinations: tuple[str, ...], depth_first: bool = False) -> int:
+    """Maximum flow from source to all destinations combined, by Edmonds-Karp.
+
+    Each line is a directed edge "from-to capacity", where a capacity of Inf is unlimited.
+    With `depth_first`, augmenting paths are found depth first instead (plain Ford-Fulkerson),
+    which can take far more, and longer, paths to reach the same flow.
+    """
+    residual = defaultdict(lambda: defaultdict(float))
+    for line in puzzle_input.splitlines():
+        if not line.strip():
+            continue
+        edge, capacity = line.split()
+        start, end = edge.split("-")
+        residual[start][end] += math.inf if capacity == "Inf" else int(capacity)
+        residual[end][start] += 0
+    for destination in destinations:
+        residual[destination][SINK] = math.inf
+        residual[SINK][destination] += 0
+
+    flow = 0
+    while True:
+        parents = {source: None}
+        queue = deque([source])
+        take = queue.pop if depth_first else queue.popleft
+        while queue and SINK not in parents:
+            node = take()
+            for linked, capacity in residual[node].items():
+                if capacity > 0 and linked not in parents:
+                    parents[linked] = node
+                    queue.append(linked)
+        if SINK not in parents:
+            return int(flow)
+
+        path = []
+        node = SINK
+        while parents[node] is not None:
+            path.append((parents[node], node))
+            node = parents[node]
+        added = min(residual[start][end] for start, end in path)
+        for start, end in path:
+            residual[start][end] -= added
+            residual[end][start] += added
+        flow += added
@@ -0,0 +1,184 @@
+import atexit
+import os
+import queue
+import threading
+from datetime import datetime, timezone
+
+from flask import Flask
+from sqlalchemy import and_, case, distinct, func, insert, select
+
+from models import db, Submission
+
+# Submissions held in memory waiting to be written; more than this are dropped and counted
+BUFFER_SIZE = 10000
+# Rows written per INSERT, and the longest a submission waits in the buffer
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 2.0
+# Longest wrong guess kept, in characters
+MAX_GUESS_LENGTH = 100
+
+
+class SubmissionLog:
+    """Append-only log of answer submissions, written in batches by a background thread.
+
+    The request path only puts a row on a bounded in-memory queue. A writer thread, started
+    lazily in each gunicorn worker, takes up to BATCH_SIZE rows at a time and writes them with
+    one multi-row INSERT. When the database falls behind and the queue is full, new submissions
+    are dropped and counted in `dropped` instead of slowing down the request.
+    """
+
+    def __init__(self, app: Flask, buffer_size: int = BUFFER_SIZE):
+        self.app = app
+        self.buffer = queue.Queue(maxsize=buffer_size)
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.writer_pid = None
+
+    def record(self, client: str, week: int, part: int, correct: bool, guess: str) -> None:
+        """Queue a submission to be written. Never blocks and never touches the database."""
+        self.start()
+        row = {
+            "client": client,
+            "week": week,
+            "part": part,
+            "correct": correct,
+            "guess": None if correct else guess[:MAX_GUESS_LENGTH],
+            "created_at": datetime.now(timezone.utc),
+        }
+        try:
+            self.buffer.put_nowait(row)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def start(self) -> None:
+        """Start the writer thread in this process, if it isn't running yet (gunicorn forks after import)."""
+        if self.writer_pid == os.getpid():
+            return
+        with self.lock:
+            if self.writer_pid == os.getpid():
+                return
+            self.writer_pid = os.getpid()
+            threading.Thread(target=self.run, name="submission-log", daemon=True).start()
+            atexit.register(self.flush)
+
+    def run(self) -> None:
+        while True:
+            try:
+                rows = [self.buffer.get(timeout=FLUSH_INTERVAL)]
+            except queue.Empty:
+                continue
+            self.write(rows + self.drain(BATCH_SIZE - 1))
+
+    def drain(self, limit: int) -> list[dict]:
+        rows = []
+        while len(rows) < limit:
+            try:
+                rows.append(self.buffer.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def flush(self) -> None:
+        """Write everything still buffered, e.g. when the worker shuts down."""
+        while rows := self.drain(BATCH_SIZE):
+            self.write(rows)
+
+    def write(self, rows: list[dict]) -> None:
+        """Insert a batch of submissions with a single multi-row INSERT. A failed batch is dropped."""
+        with self.app.app_context():
+            try:
+                db.session.execute(insert(Submission).values(rows))
+                db.session.commit()
+            except Exception as e:
+                self.app.logger.exception(f"Error writing {len(rows)} submissions: {e}")
+                db.session.rollback()
+                with self.lock:
+                    self.dropped += len(rows)
+
+    def funnel(self) -> dict[int, dict[str, int]]:
+        """Distinct clients per week that attempted and solved each part."""
+        def clients(*conditions):
+            return func.count(distinct(case((and_(*conditions), Submission.client))))
+
+        with self.app.app_context():
+            rows = db.session.execute(
+                select(
+                    Submission.week,
+                    clients(Submission.part == 1),
+                    clients(Submission.part == 1, Submission.correct),
+                    clients(Submission.part == 2),
+                    clients(Submission.part == 2, Submission.correct),
+                )
+                .group_by(Submission.week)
+                .order_by(Submission.week)
+            ).all()
+        return {
+            week: {"attempted1": a1, "solved1": s1, "attempted2": a2, "solved2": s2}
+            for week, a1, s1, a2, s2 in rows
+        }
+
+    def solve_times(self) -> dict[int, dict[int, dict[str, float | int]]]:
+        """Median and 90th percentile seconds from a client's first guess on a part to their first correct one."""
+        first = (
+            select(
+                Submission.week,
+                Submission.part,
+                func.min(Submission.created_at).label("first_guess"),
+                func.min(Submission.created_at).filter(Submission.correct).label("solved_at"),
+                func.count().label("guesses"),
+            )
+            .group_by(Submission.client, Submission.week, Submission.part)
+            .subquery()
+        )
+        seconds = func.extract("epoch", first.c.solved_at - first.c.first_guess)
+        with self.app.app_context():
+            rows = db.session.execute(
+                select(
+                    first.c.week,
+                    first.c.part,
+                    func.count(),
+                    func.percentile_cont(0.5).within_group(seconds),
+                    func.percentile_cont(0.9).within_group(seconds),
+                    func.avg(first.c.guesses),
+                )
+                .where(first.c.solved_at.isnot(None))
+                .group_by(first.c.week, first.c.part)
+                .order_by(first.c.week, first.c.part)
+            ).all()
+        times = {}
+        for week, part, solvers, median, p90, guesses in rows:
+            times.setdefault(week, {})[part] = {
+                "solvers": solvers,
+                "median_seconds": round(median, 1),
+                "p90_seconds": round(p90, 1),
+                "average_guesses": round(float(guesses), 2),
+            }
+        return times
+
+    def wrong_answers(self, limit: int = 10) -> dict[int, dict[int, list[dict[str, str | int]]]]:
+        """The `limit` most common wrong guesses of each part of each week."""
+        counts = (
+            select(
+                Submission.week,
+                Submission.part,
+                Submission.guess,
+                func.count().label("count"),
+                func.row_number()
+                .over(partition_by=(Submission.week, Submission.part), order_by=func.count().desc())
+                .label("rank"),
+            )
+            .where(Submission.correct.is_(False))
+            .group_by(Submission.week, Submission.part, Submission.guess)
+            .subquery()
+        )
+        with self.app.app_context():
+            rows = db.session.execute(
+                select(counts.c.week, counts.c.part, counts.c.guess, counts.c.count)
+                .where(counts.c.rank <= limit)
+                .order_by(counts.c.week, counts.c.part, counts.c.rank)
+            ).all()
+        guesses = {}
+        for week, part, guess, count in rows:
+            guesses.setdefault(week, {}).setdefault(part, []).append({"guess": guess, "count": count})
+        return guesses
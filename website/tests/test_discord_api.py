@@ -0,0 +1,190 @@
+"""Tests for the Discord REST client against a local stub of the Discord API.
+
+Usage: python -m unittest discover tests (from the website folder)
+"""
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from benchmarks.discord_rate_limit import FakeDiscord  # noqa: E402
+from discord_api import DiscordClient  # noqa: E402
+from jobs import VERIFIED_ROLE, grant_access  # noqa: E402
+
+GUILD_ID = "1162111325423431750"
+CHANNEL_ID = "900302240559018015"
+USER_ID = "123456789012345678"
+
+
+class StubDiscord(ThreadingHTTPServer):
+    """A local Discord API that answers each (method, path) with a canned response.
+
+    A route given a list of responses answers with them in turn, repeating the last one.
+    Every call is recorded with the client port it came in on, so tests can tell whether
+    connections were reused, and the most calls in flight at once is tracked.
+    """
+    daemon_threads = True
+
+    def __init__(self, routes: dict[tuple[str, str], tuple[int, dict] | list[tuple[int, dict]]], delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StubDiscordHandler)
+        self.routes = routes
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = []  # (method, path, client port)
+        self.in_flight = 0
+        self.most_in_flight = 0
+
+    def __enter__(self) -> "StubDiscord":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class StubDiscordHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def handle_call(self) -> None:
+        if length := int(self.headers.get("Content-Length", 0)):
+            self.rfile.read(length)
+        server = self.server
+        with server.lock:
+            server.calls.append((self.command, self.path, self.client_address[1]))
+            response = server.routes.get((self.command, self.path), (404, {"message": "Unknown"}))
+            if isinstance(response, list):
+                response = response.pop(0) if len(response) > 1 else response[0]
+            server.in_flight += 1
+            server.most_in_flight = max(server.most_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+            status, body = response
+            payload = json.dumps(body).encode() if status != 204 else b""
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    do_GET = do_PUT = do_POST = handle_call
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+class DiscordClientTest(unittest.TestCase):
+    def test_read_timeout_applies_by_default(self):
+        with StubDiscord({("GET", "/v9/users/@me"): (200, {})}, delay=1.0) as server:
+            client = DiscordClient(base_url=server.url)
+            client.timeout = (1.0, 0.2)
+            start = time.perf_counter()
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                client.get("/v9/users/@me")
+            self.assertLess(time.perf_counter() - start, 0.9)
+
+    def test_connect_timeout_to_unreachable_host(self):
+        # 10.255.255.1 is not routable, so the handshake never completes
+        client = DiscordClient(base_url="http://10.255.255.1")
+        client.timeout = (0.2, 1.0)
+        start = time.perf_counter()
+        with self.assertRaises((requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError)):
+            client.get("/v9/users/@me")
+        self.assertLess(time.perf_counter() - start, 0.9)
+
+    def test_sequential_calls_reuse_one_connection(self):
+        with StubDiscord({("GET", "/v9/users/@me"): (200, {"id": USER_ID})}) as server:
+            client = DiscordClient(base_url=server.url)
+            for _ in range(5):
+                self.assertEqual(client.get("/v9/users/@me").json(), {"id": USER_ID})
+            self.assertEqual(len(server.calls), 5)
+            self.assertEqual(len({port for _, _, port in server.calls}), 1)
+
+    def test_concurrent_calls_share_the_pool(self):
+        with StubDiscord({("GET", "/v9/users/@me"): (200, {})}, delay=0.05) as server:
+            client = DiscordClient(base_url=server.url, pool_size=4)
+            for _ in range(3):
+                futures = [client.submit("GET", "/v9/users/@me") for _ in range(4)]
+                self.assertEqual([future.result().status_code for future in futures], [200] * 4)
+            self.assertLessEqual(len({port for _, _, port in server.calls}), 4)
+
+    def test_rate_limited_calls_wait_for_their_bucket(self):
+        server = FakeDiscord(limit=3, window=0.3)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = DiscordClient(base_url=f"http://127.0.0.1:{server.server_port}")
+            futures = [client.submit("POST", f"/v9/channels/{CHANNEL_ID}/messages", json={}) for _ in range(9)]
+            self.assertEqual([future.result().status_code for future in futures], [200] * 9)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_429_without_bucket_waits_before_retrying(self):
+        limited = (429, {"message": "You are being rate limited.", "retry_after": 0.2, "global": False})
+        with StubDiscord({("GET", "/v9/users/@me"): [limited, limited, (200, {})]}) as server:
+            client = DiscordClient(base_url=server.url)
+            start = time.perf_counter()
+            self.assertEqual(client.get("/v9/users/@me").status_code, 200)
+            self.assertGreaterEqual(time.perf_counter() - start, 0.4)
+            self.assertEqual(len(server.calls), 3)
+
+
+class GrantAccessTest(unittest.TestCase):
+    member_path = f"/v9/guilds/{GUILD_ID}/members/{USER_ID}"
+    thread_member_path = f"/v9/channels/{CHANNEL_ID}/thread-members/{USER_ID}"
+
+    def grant(self, server: StubDiscord) -> None:
+        client = DiscordClient(base_url=server.url)
+        grant_access(client, "bot-token", GUILD_ID, CHANNEL_ID, USER_ID, 3, "oauth-token")
+
+    def test_checks_run_concurrently(self):
+        routes = {("GET", self.member_path): (200, {}), ("GET", self.thread_member_path): (200, {})}
+        with StubDiscord(routes, delay=0.3) as server:
+            start = time.perf_counter()
+            self.grant(server)
+            elapsed = time.perf_counter() - start
+        self.assertEqual(server.most_in_flight, 2)
+        self.assertLess(elapsed, 0.55)
+
+    def test_new_member_is_added_verified_and_announced(self):
+        routes = {
+            ("PUT", self.member_path): (201, {}),
+            ("PUT", f"{self.member_path}/roles/{VERIFIED_ROLE}"): (204, {}),
+            ("POST", f"/v9/channels/{CHANNEL_ID}/messages"): (200, {"id": "1"}),
+        }
+        with StubDiscord(routes) as server:
+            self.grant(server)
+        self.assertEqual(
+            sorted(call[:2] for call in server.calls),
+            sorted([
+                ("GET", self.member_path),
+                ("GET", self.thread_member_path),
+                ("PUT", self.member_path),
+                ("PUT", f"{self.member_path}/roles/{VERIFIED_ROLE}"),
+                ("POST", f"/v9/channels/{CHANNEL_ID}/messages"),
+            ]),
+        )
+
+    def test_existing_thread_member_is_not_announced_again(self):
+        routes = {("GET", self.member_path): (200, {}), ("GET", self.thread_member_path): (200, {})}
+        with StubDiscord(routes) as server:
+            self.grant(server)
+        self.assertEqual({method for method, _, _ in server.calls}, {"GET"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import math
+from datetime import timedelta
+
+from flask import Flask
+from sqlalchemy import delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from models import db, SubmissionLimit
+
+# Guesses a client can make on one week in a burst, and how many it gets back per minute
+GUESS_BURST = 10
+GUESSES_PER_MINUTE = 6
+# Buckets untouched for this long are full again and can be deleted
+IDLE_EXPIRY = timedelta(days=1)
+
+
+class SubmissionLimiter:
+    """Token bucket per (client, week) for answer submissions, shared by every worker through Postgres.
+
+    Each bucket holds up to `capacity` guesses and refills at `rate` guesses per second. Taking a
+    guess is a single upsert that refills the bucket for the time elapsed since it was last used
+    and only writes when a guess is available, so rejected guesses never change the row.
+    """
+
+    def __init__(self, app: Flask, capacity: float = GUESS_BURST, per_minute: float = GUESSES_PER_MINUTE):
+        self.app = app
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    def allow(self, client: str, week: int) -> bool:
+        """Take one guess from the client's bucket for a week. Returns False if the bucket is empty.
+
+        If the database cannot be reached the guess is allowed, so checking answers never depends on the limiter.
+        """
+        elapsed = func.extract("epoch", func.now() - SubmissionLimit.updated_at)
+        refilled = func.least(self.capacity, SubmissionLimit.tokens + elapsed * self.rate)
+        statement = (
+            insert(SubmissionLimit)
+            .values(client=client, week=week, tokens=self.capacity - 1, updated_at=func.now())
+            .on_conflict_do_update(
+                index_elements=[SubmissionLimit.client, SubmissionLimit.week],
+                set_={"tokens": refilled - 1, "updated_at": func.now()},
+                where=refilled >= 1,
+            )
+            .returning(SubmissionLimit.tokens)
+        )
+        try:
+            with self.app.app_context():
+                row = db.session.execute(statement).first()
+                db.session.commit()
+        except Exception as e:
+            self.app.logger.exception(f"Error checking submission limit for {client} week {week}: {e}")
+            db.session.rollback()
+            return True
+        return row is not None
+
+    def retry_after(self) -> int:
+        """Seconds until an empty bucket has room for another guess."""
+        return math.ceil(1 / self.rate)
+
+    def prune(self) -> None:
+        """Delete buckets that have been idle long enough to be full again."""
+        with self.app.app_context():
+            try:
+                db.session.execute(delete(SubmissionLimit).where(SubmissionLimit.updated_at < func.now() - IDLE_EXPIRY))
+                db.session.commit()
+            except Exception as e:
+                self.app.logger.exception(f"Error pruning submission limits: {e}")
+                db.session.rollback()
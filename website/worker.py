@@ -0,0 +1,58 @@
+import os
+import time
+
+from app import app, data_cache, discord_client
+from jobs import DiscordJobError, JobQueue, grant_access
+from sessions import PostgresSessionStore
+from throttle import SubmissionLimiter
+
+# Seconds to sleep when no jobs are due
+POLL_INTERVAL = 1.0
+# Seconds between deletions of idle submission limit buckets and expired sessions
+PRUNE_INTERVAL = 60 * 60
+
+
+def run_job(queue: JobQueue, bot_token: str, job: dict) -> None:
+    """Run one claimed job and record its outcome."""
+    try:
+        grant_access(
+            discord_client,
+            bot_token,
+            data_cache.discord_ids["guild"],
+            data_cache.discord_ids[f"{job['week']}"],
+            job["user_id"],
+            job["week"],
+            job["token"],
+        )
+    except (DiscordJobError, KeyError) as e:
+        app.logger.warning(f"Discord job {job['id']} failed (attempt {job['attempts']}): {e}")
+        queue.retry(job["id"], job["attempts"], str(e))
+    else:
+        queue.complete(job["id"])
+        app.logger.info(f"Discord access granted to {job['user_id']} for week {job['week']}.")
+
+
+def main():
+    bot_token = os.environ.get("BOT_TOKEN")
+    if not bot_token:
+        raise SystemExit("Error: Bot token not found")
+
+    queue = JobQueue(app)
+    limiter = SubmissionLimiter(app)
+    sessions = PostgresSessionStore(app)
+    last_prune = 0.0
+    while True:
+        data_cache.sync()
+        if time.monotonic() - last_prune >= PRUNE_INTERVAL:
+            limiter.prune()
+            sessions.prune()
+            last_prune = time.monotonic()
+        jobs = queue.claim()
+        for job in jobs:
+            run_job(queue, bot_token, job)
+        if not jobs:
+            time.sleep(POLL_INTERVAL)
+
+
+if __name__ == "__main__":
+    main()